@@ -7,8 +7,121 @@ Output format: ROCmGemmConfig constructor calls
 """
 
 import sys
-import ast
+import re
+import codecs
 import argparse
+from functools import partial
+from itertools import chain, islice
+from multiprocessing import Pool
+
+# Matches one "'key': <value>" pair of a config dict string, where the value
+# runs up to the next ',' or '}'. Keys may appear in any order, so every pair
+# is collected and looked up by name afterwards; required values must then be
+# plain integers.
+FIELD_RE = re.compile(r"""['"]?(\w+)['"]?\s*:\s*([^,{}]*?)\s*(?=[,}]|$)""")
+_INT_VALUE_RE = re.compile(r"-?\d+")
+
+# Line breaks recognized by text-mode file iteration (universal newlines)
+_LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+
+# Buffer size for reading the input and writing the output file (1 MiB)
+IO_BUFFER_SIZE = 1 << 20
+
+REQUIRED_FIELDS = (
+    'BLOCK_SIZE_M',
+    'BLOCK_SIZE_N',
+    'BLOCK_SIZE_K',
+    'num_stages',
+    'num_warps',
+    'GROUP_SIZE_M',
+    'waves_per_eu',
+    'kpack',
+)
+
+# ROCmGemmConfig line for a config tuple, in REQUIRED_FIELDS order
+CONFIG_TEMPLATE = ("            ROCmGemmConfig(%d, %d, %d, %d, %d, "
+                   "group_m=%d, waves_per_eu=%d, kpack=%d),")
+
+# Lines handed to a worker at a time when parsing with --jobs > 1
+PARSE_BATCH_LINES = 8192
+
+# Bits per field in the packed dedup key of a config (see config_key)
+KEY_FIELD_BITS = 16
+_KEY_FIELD_LIMIT = 1 << KEY_FIELD_BITS
+
+
+def parse_config(dict_str, prune=False):
+    """
+    Parse a dictionary string into the config tuple used for deduplication.
+
+    Args:
+        dict_str: String representation of a dictionary
+        prune: If True, apply pruning rules to reduce configs
+
+    Returns:
+        Tuple of (config_tuple, was_pruned). Raises ValueError if a required
+        field is missing or its value is not an integer literal.
+    """
+    # Remove leading "- " if present (common in YAML-style lists)
+    dict_str = dict_str.strip()
+    if dict_str.startswith('- '):
+        dict_str = dict_str[2:].strip()
+
+    # Extract the integer fields directly instead of parsing a full dict
+    fields = dict(FIELD_RE.findall(dict_str))
+    missing = [k for k in REQUIRED_FIELDS if k not in fields]
+    if missing:
+        raise ValueError(f"Missing required fields: {missing}")
+
+    invalid = [f"{k}={fields[k]}" for k in REQUIRED_FIELDS
+               if not _INT_VALUE_RE.fullmatch(fields[k])]
+    if invalid:
+        raise ValueError(f"Non-integer required fields: {invalid}")
+
+    (block_size_m, block_size_n, block_size_k, num_stages,
+     num_warps, group_size_m, waves_per_eu, kpack) = (
+        int(fields[k]) for k in REQUIRED_FIELDS)
+
+    # Track if this config was modified by pruning
+    was_pruned = False
+
+    # Apply pruning rules if enabled
+    if prune:
+        # Check if waves_per_eu will be changed
+        if waves_per_eu != 0:
+            was_pruned = True
+        waves_per_eu = 0
+
+        # Set num_stages=3 to 2
+        if num_stages == 3:
+            num_stages = 2
+            was_pruned = True
+
+    # Create a tuple for deduplication (based on final output values)
+    config_tuple = (block_size_m, block_size_n, block_size_k, num_stages,
+                    num_warps, group_size_m, waves_per_eu, kpack)
+    return config_tuple, was_pruned
+
+
+def config_key(config_tuple):
+    """
+    Pack a config tuple into a single int for the dedup set.
+
+    Each field takes KEY_FIELD_BITS bits, so one int replaces an 8-element
+    tuple per seen config. A config with a field outside [0, 2**KEY_FIELD_BITS)
+    keeps the tuple itself as its key, which never equals an int key.
+    """
+    key = 0
+    for value in config_tuple:
+        if not 0 <= value < _KEY_FIELD_LIMIT:
+            return config_tuple
+        key = (key << KEY_FIELD_BITS) | value
+    return key
+
+
+def format_config(config_tuple):
+    """Format a config tuple from parse_config as a ROCmGemmConfig call."""
+    return CONFIG_TEMPLATE % config_tuple
 
 
 def convert_dict_to_config(dict_str, prune=False):
@@ -23,66 +136,71 @@ def convert_dict_to_config(dict_str, prune=False):
         Tuple of (formatted ROCmGemmConfig string, config_tuple for deduplication, was_pruned)
     """
     try:
-        # Remove leading "- " if present (common in YAML-style lists)
-        dict_str = dict_str.strip()
-        if dict_str.startswith('- '):
-            dict_str = dict_str[2:].strip()
-
-        # Parse the string as a Python dictionary
-        config_dict = ast.literal_eval(dict_str)
-
-        # Extract required values
-        block_size_m = config_dict.get('BLOCK_SIZE_M')
-        block_size_n = config_dict.get('BLOCK_SIZE_N')
-        block_size_k = config_dict.get('BLOCK_SIZE_K')
-        num_stages = config_dict.get('num_stages')
-        num_warps = config_dict.get('num_warps')
-        group_size_m = config_dict.get('GROUP_SIZE_M')
-        waves_per_eu = config_dict.get('waves_per_eu')
-        kpack = config_dict.get('kpack')
-
-        # Check if all required fields are present
-        required_fields = {
-            'BLOCK_SIZE_M': block_size_m,
-            'BLOCK_SIZE_N': block_size_n,
-            'BLOCK_SIZE_K': block_size_k,
-            'num_stages': num_stages,
-            'num_warps': num_warps,
-            'GROUP_SIZE_M': group_size_m,
-            'waves_per_eu': waves_per_eu,
-            'kpack': kpack
-        }
-
-        missing = [k for k, v in required_fields.items() if v is None]
-        if missing:
-            raise ValueError(f"Missing required fields: {missing}")
-
-        # Track if this config was modified by pruning
-        was_pruned = False
-
-        # Apply pruning rules if enabled
-        if prune:
-            # Check if waves_per_eu will be changed
-            if waves_per_eu != 0:
-                was_pruned = True
-            waves_per_eu = 0
+        config_tuple, was_pruned = parse_config(dict_str, prune=prune)
+        return format_config(config_tuple), config_tuple, was_pruned
 
-            # Set num_stages=3 to 2
-            if num_stages == 3:
-                num_stages = 2
-                was_pruned = True
+    except Exception as e:
+        return f"# ERROR: Could not parse line: {e}", None, False
 
-        # Create a tuple for deduplication (based on final output values)
-        config_tuple = (block_size_m, block_size_n, block_size_k, num_stages,
-                       num_warps, group_size_m, waves_per_eu, kpack)
 
-        # Format the output
-        output = f"            ROCmGemmConfig({block_size_m}, {block_size_n}, {block_size_k}, {num_stages}, {num_warps}, group_m={group_size_m}, waves_per_eu={waves_per_eu}, kpack={kpack}),"
+def read_lines(f):
+    """
+    Yield the lines of a binary file object opened on UTF-8 text.
 
-        return output, config_tuple, was_pruned
+    Reads IO_BUFFER_SIZE blocks and decodes each once instead of iterating in
+    text mode. Lines are framed like text-mode iteration (universal newlines:
+    '\n', '\r\n' or '\r'), not str.splitlines, so characters such as '\x0c'
+    or '\u2028' stay inside their line. Only one block and the partial line at
+    its end are held at a time. Lines are yielded without their line ending.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    tail = ''
+    while True:
+        block = f.read(IO_BUFFER_SIZE)
+        text = tail + decoder.decode(block, final=not block)
+        if not block:
+            lines = _LINE_BREAK_RE.split(text)
+            if lines[-1] == '':
+                lines.pop()
+            yield from lines
+            return
+        # A trailing '\r' may be the first half of a '\r\n' split across blocks
+        cut = len(text) - 1 if text.endswith('\r') else len(text)
+        lines = _LINE_BREAK_RE.split(text[:cut])
+        tail = lines.pop() + text[cut:]
+        yield from lines
+
+
+def parse_lines(lines, prune=False):
+    """
+    Parse raw input lines, skipping blank ones.
 
-    except Exception as e:
-        return f"# ERROR: Could not parse line: {e}", None, False
+    Yields (kind, value, was_pruned) per line, where kind is 'comment' (value
+    is the stripped line), 'error' (value is the error message) or 'config'
+    (value is the config tuple from parse_config).
+    """
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines
+        if not line:
+            continue
+
+        # Skip comment lines (if any)
+        if line.startswith('#'):
+            yield 'comment', line, False
+            continue
+
+        try:
+            config_tuple, was_pruned = parse_config(line, prune=prune)
+        except Exception as e:
+            yield 'error', str(e), False
+            continue
+        yield 'config', config_tuple, was_pruned
+
+
+def _parse_batch(lines, prune=False):
+    """Pool worker: parse one batch of lines (see parse_lines)."""
+    return list(parse_lines(lines, prune=prune))
 
 
 def main():
@@ -99,76 +217,89 @@ def main():
                         help='Output file (optional, prints to stdout if not provided)')
     parser.add_argument('--prune', action='store_true',
                         help='Apply pruning rules: set waves_per_eu=0 and num_stages=3 to 2')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Parse with this many worker processes (default: 1, no pool)')
 
     args = parser.parse_args()
 
     input_file = args.input_file
     output_file = args.output_file
     prune = args.prune
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
 
     try:
-        # Read input file
-        with open(input_file, 'r') as f:
-            lines = f.readlines()
-
         # Convert each line and track unique configs
-        converted_lines = []
-        seen_configs = set()  # Track unique configurations
+        converted_count = 0
+        seen_configs = set()  # Track unique configurations (by config_key)
         duplicates_count = 0
         total_processed = 0
         pruned_count = 0
 
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Skip comment lines (if any)
-            if line.startswith('#'):
-                converted_lines.append(line)
-                continue
-
-            total_processed += 1
-            converted, config_tuple, was_pruned = convert_dict_to_config(line, prune=prune)
-
-            # Track pruning
-            if was_pruned:
-                pruned_count += 1
-
-            # Skip if this is an error
-            if config_tuple is None:
-                converted_lines.append(converted)
-                continue
-
-            # Check for duplicates
-            if config_tuple in seen_configs:
-                duplicates_count += 1
-                continue  # Skip this duplicate
-
-            # Add to seen configs and output
-            seen_configs.add(config_tuple)
-            converted_lines.append(converted)
-
-        # Output results
-        output_text = '\n'.join(converted_lines)
+        # Stream input -> output: read lazily and write each converted line as
+        # soon as it is produced, so only the dedup set grows with the input.
+        # The output file is opened after the input so a bad input path does
+        # not leave an empty output behind.
+        with open(input_file, 'rb', buffering=0) as f:
+            lines = read_lines(f)
+            # Write through a large buffer so many short lines become few syscalls
+            out = open(output_file, 'w', buffering=IO_BUFFER_SIZE) if output_file else sys.stdout
+            pool = None
+            try:
+                if args.jobs > 1:
+                    # Parse batches in workers; imap keeps input order, so the
+                    # output and which duplicate is kept match the serial path
+                    pool = Pool(args.jobs)
+                    batches = iter(lambda: list(islice(lines, PARSE_BATCH_LINES)), [])
+                    entries = chain.from_iterable(
+                        pool.imap(partial(_parse_batch, prune=prune), batches))
+                else:
+                    entries = parse_lines(lines, prune=prune)
+
+                for kind, value, was_pruned in entries:
+                    if kind == 'comment':
+                        out.write(value + '\n')
+                        converted_count += 1
+                        continue
+
+                    total_processed += 1
+                    if kind == 'error':
+                        out.write(f"# ERROR: Could not parse line: {value}\n")
+                        converted_count += 1
+                        continue
+
+                    # Track pruning
+                    if was_pruned:
+                        pruned_count += 1
+
+                    # Check for duplicates before paying for output formatting
+                    key = config_key(value)
+                    if key in seen_configs:
+                        duplicates_count += 1
+                        continue  # Skip this duplicate
+
+                    # Add to seen configs and output
+                    seen_configs.add(key)
+                    out.write(format_config(value) + '\n')
+                    converted_count += 1
+            finally:
+                if pool is not None:
+                    pool.terminate()
+                if output_file:
+                    out.close()
+                else:
+                    out.flush()
 
         # Print statistics to stderr (so they don't interfere with stdout output)
         print(f"Total configs processed: {total_processed}", file=sys.stderr)
-        print(f"Successfully converted {len(converted_lines)} unique lines", file=sys.stderr)
+        print(f"Successfully converted {converted_count} unique lines", file=sys.stderr)
         if duplicates_count > 0:
             print(f"Removed {duplicates_count} duplicate configurations", file=sys.stderr)
         if prune:
             print(f"Pruning applied: waves_per_eu=0, num_stages=3->2", file=sys.stderr)
             print(f"Configs modified by pruning: {pruned_count}", file=sys.stderr)
-
         if output_file:
-            with open(output_file, 'w') as f:
-                f.write(output_text)
-                f.write('\n')
             print(f"Output written to: {output_file}", file=sys.stderr)
-        else:
-            print(output_text)
 
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found", file=sys.stderr)
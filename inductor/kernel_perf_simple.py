@@ -2,31 +2,51 @@ import pandas as pd
 import numpy as np
 import sys
 
+# Only these columns are used; skip parsing the rest of each CSV
+CSV_COLUMNS = ['kernel_name', 'ms_per_call']
+
+
+def read_csv_columns(path, columns):
+    # The pyarrow parser is multi-threaded; fall back if it is not installed
+    try:
+        return pd.read_csv(path, usecols=columns, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(path, usecols=columns)
+
+
+def geometric_mean(values):
+    # Geometric mean as exp(mean(log(x))), computed in place on one float
+    # array instead of building intermediate Series for log() and mean()
+    logs = np.asarray(values, dtype=np.float64).copy()
+    np.log(logs, out=logs)
+    # Skip missing ratios like Series.mean() does
+    logs = logs[~np.isnan(logs)]
+    return float(np.exp(logs.mean())) if logs.size else float('nan')
+
+
 def main(ref_csv, opt_csv, output_csv):
     threshold = 0.008 # microsecond
 
     # Read both CSVs
-    ref_df = pd.read_csv(ref_csv)
-    opt_df = pd.read_csv(opt_csv)
-
-    # Drop rows missing any of the key columns
-    required_cols = ['kernel_name', 'ms_per_call']
-    ref_df = ref_df.dropna(subset=required_cols)
-    opt_df = opt_df.dropna(subset=required_cols)
+    ref_df = read_csv_columns(ref_csv, CSV_COLUMNS)
+    opt_df = read_csv_columns(opt_csv, CSV_COLUMNS)
 
-    # Filter: kernel_name starts with "triton_red_"
-    ref_df = ref_df[ref_df['kernel_name'].str.match(r'^triton_poi_')]
-    opt_df = opt_df[opt_df['kernel_name'].str.match(r'^triton_poi_')]
+    # Filter each side with one combined mask before the join, rather than
+    # materializing a new frame per filter step:
+    #   - drop rows missing any of the key columns
+    #   - kernel_name starts with "triton_poi_"
+    #   - reference only: keep non-zero values, and filter out really small
+    #     kernels as they could have a large variation
+    def keep_mask(df):
+        return (
+            df['kernel_name'].notna()
+            & df['ms_per_call'].notna()
+            & df['kernel_name'].str.startswith('triton_poi_', na=False)
+        )
 
-    # Keep only non-zero values in reference CSV
-    ref_df = ref_df[
-        (ref_df['ms_per_call'] > 0)
-    ]
-
-    # Filter out really small kernels as they could have a large variation
-    ref_df = ref_df[
-        (ref_df['ms_per_call'] > threshold)
-    ]
+    ref_ms = ref_df['ms_per_call']
+    ref_df = ref_df[keep_mask(ref_df) & (ref_ms > 0) & (ref_ms > threshold)]
+    opt_df = opt_df[keep_mask(opt_df)]
 
     # Merge only on valid reference names (inner join)
     merged = pd.merge(ref_df, opt_df, on='kernel_name', suffixes=('_ref', '_opt'))
@@ -45,12 +65,9 @@ def main(ref_csv, opt_csv, output_csv):
     result.to_csv(output_csv, index=False)
     print(f"Saved output to {output_csv}")
 
-    geo_mean = np.exp(np.log(result['latency_ratio']).mean())
+    geo_mean = geometric_mean(result['latency_ratio'])
     print(geo_mean)
 
-    # from scipy.stats import gmean
-    # print(gmean(result['latency_ratio']))
-
 if __name__ == "__main__":
     if len(sys.argv) != 4:
         print("Usage: python compare_latencies.py <reference.csv> <optimized.csv> <output.csv>")
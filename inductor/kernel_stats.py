@@ -30,6 +30,24 @@ def get_base_name(name: str) -> str:
     return m.group(1) if m else name
 
 
+def group_percentile(values, starts, sizes, q):
+    """
+    Return the q-th percentile (0-100) of each group of `values`, where group i
+    is values[starts[i]:starts[i] + sizes[i]] and is already sorted.
+
+    Uses the same linear interpolation as np.percentile's default method.
+    """
+    pos = (sizes - 1) * (q / 100.0)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, sizes - 1)
+    t = pos - lo
+    a = values[starts + lo]
+    b = values[starts + hi]
+    diff = b - a
+    # np.percentile interpolates from the upper neighbour when t >= 0.5
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Compute 10th/mean/90th percentiles and counts for kernels (base + hash variants)."
@@ -43,21 +61,38 @@ def main():
     df["kernel_name"] = df["kernel_name"].astype(str)
 
     # Extract base name (with integer, without hash)
-    df["base_name"] = df["kernel_name"].apply(get_base_name)
+    # (vectorized equivalent of get_base_name), once per distinct kernel_name
+    # since the same names repeat across rows, then broadcast back by code
+    codes, names = pd.factorize(df["kernel_name"])
+    names = pd.Series(names)
+    bases = names.str.extract(BASE_RE, expand=False).fillna(names)
+    df["base_name"] = bases.to_numpy()[codes]
+    # Many rows share a base; as a categorical the sort and groupby below work
+    # on integer codes (categories are sorted, so output order is unchanged)
+    df["base_name"] = df["base_name"].astype("category")
 
     # ---- Group by base_name (includes plain + hashed) ---------------------
+    # Sort once so every group is a contiguous, ordered slice (NaNs at its
+    # end); percentiles are then a positional gather over the non-NaN part
+    # instead of one np.percentile call per group.
+    df = df.sort_values(["base_name", "ms_per_call"], na_position="last")
+    grouped = df.groupby("base_name", observed=True)["ms_per_call"]
     stats = (
-        df.groupby("base_name")["ms_per_call"]
-        .agg(
-            p10=lambda x: np.percentile(x, 10),
-            mean="mean",
-            p90=lambda x: np.percentile(x, 90),
-            count="count",      # <- counts all rows: base + hashes
-        )
+        grouped.agg(mean="mean", count="count")    # <- counts all rows: base + hashes
         .reset_index()
-        .sort_values("base_name")
     )
 
+    values = df["ms_per_call"].to_numpy(dtype=float)
+    sizes = grouped.size().to_numpy()
+    starts = np.cumsum(sizes) - sizes
+    counts = stats["count"].to_numpy()
+    # As with np.percentile, a group holding any NaN (including an all-NaN
+    # group, whose count is 0) gets NaN percentiles
+    has_nan = counts < sizes
+    valid = np.maximum(counts, 1)
+    stats.insert(1, "p10", np.where(has_nan, np.nan, group_percentile(values, starts, valid, 10)))
+    stats.insert(3, "p90", np.where(has_nan, np.nan, group_percentile(values, starts, valid, 90)))
+
     # ---- Add p90/p10 ratio ------------------------------------------------
     stats["p90_over_p10"] = stats["p90"] / stats["p10"]
 
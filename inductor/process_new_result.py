@@ -1,63 +1,106 @@
 import pandas as pd
 import re
 
+# Trailing _<digits> index of a kernel name
+_SUFFIX_RE = re.compile(r'_\d+$')
+# Kernel prefix that selects a pattern group; anything else is "other"
+_PATTERN_RE = r'^(triton_(?:poi|red|per|for))_'
+# Columns of the result CSV (csv1) that are used; also kept after filtering
+RESULT_COLUMNS = ["s_name", "sum_latency_mi350x", "avg_latency_mi350x", "count_mi350x"]
+# Columns of the kernel metadata CSV (csv2) that are used
+KERNEL_COLUMNS = ["kernel_name", "ms_per_call"]
+# Kernel names are parsed as strings up front instead of being inferred
+NAME_DTYPES = {"s_name": str, "kernel_name": str}
+
 def strip_suffix(name: str) -> str:
     """Remove trailing _<digits> from kernel name."""
-    return re.sub(r'_\d+$', '', str(name))
-
-def assign_pattern(kernel_name):
-    """Assign kernel_name to one of the four groups based on prefix."""
-    kname = str(kernel_name)  # force to string
-    if kname.startswith("triton_poi_"):
-        return "triton_poi"
-    elif kname.startswith("triton_red_"):
-        return "triton_red"
-    elif kname.startswith("triton_per_"):
-        return "triton_per"
-    elif kname.startswith("triton_for_"):
-        return "triton_for"
-    else:
-        return "other"
+    return _SUFFIX_RE.sub('', name if isinstance(name, str) else str(name))
+
+def read_csv_columns(path, columns):
+    # The pyarrow parser is multi-threaded; fall back if it is not installed
+    dtype = {c: t for c, t in NAME_DTYPES.items() if c in columns}
+    try:
+        return pd.read_csv(path, usecols=columns, dtype=dtype, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+def shared_categorical_dtype(*columns):
+    """Categorical dtype covering the string values of every given column."""
+    values = pd.concat([c.astype(str) for c in columns], ignore_index=True)
+    return pd.CategoricalDtype(values.unique())
 
 def process_csv(csv1, csv2, threshold=100, output="test.csv"):
     # Load CSVs
-    df1 = pd.read_csv(csv1)
-    df2 = pd.read_csv(csv2)
+    df1 = read_csv_columns(csv1, RESULT_COLUMNS)
+    df2 = read_csv_columns(csv2, KERNEL_COLUMNS)
 
     # Filter rows above threshold based on sum_latency_mi350x
-    filtered = df1[df1["sum_latency_mi350x"] > threshold].copy()
-    filtered["avg_latency_mi350x"] = filtered["avg_latency_mi350x"] / 1000
+    # (only the columns used below are copied)
+    filtered = df1.loc[df1["sum_latency_mi350x"] > threshold, RESULT_COLUMNS].copy()
+    filtered["avg_latency_mi350x"] /= 1000
 
     # Create base name for fallback matching
-    filtered["kernel_base"] = filtered["s_name"].apply(strip_suffix)
-    df2["kernel_base"] = df2["kernel_name"].apply(strip_suffix)
-
-    results = []
-    matched_snames = set()
-    used_kernels = set()
-
-    for _, row in filtered.iterrows():
-        s_name = row["s_name"]
-
-        # ---------- Try exact match ----------
-        exact = df2[df2["kernel_name"] == s_name]
-        if not exact.empty:
-            match = exact.iloc[0]
-            results.append({**row.to_dict(), **match.to_dict()})
-            matched_snames.add(s_name)
-            used_kernels.add(match["kernel_name"])
+    # (vectorized equivalent of strip_suffix over the whole column)
+    filtered["kernel_base"] = filtered["s_name"].astype(str).str.replace(_SUFFIX_RE, '', regex=True)
+    df2["kernel_base"] = df2["kernel_name"].astype(str).str.replace(_SUFFIX_RE, '', regex=True)
+
+    # Store the join keys as categoricals that share one dtype per key, so the
+    # merges below compare integer codes instead of Python strings
+    name_dtype = shared_categorical_dtype(filtered["s_name"], df2["kernel_name"])
+    filtered["s_name"] = filtered["s_name"].astype(name_dtype)
+    df2["kernel_name"] = df2["kernel_name"].astype(name_dtype)
+    base_dtype = shared_categorical_dtype(filtered["kernel_base"], df2["kernel_base"])
+    filtered["kernel_base"] = filtered["kernel_base"].astype(base_dtype)
+    df2["kernel_base"] = df2["kernel_base"].astype(base_dtype)
+
+    # Each kernel_name is matched at most once; keep its first row
+    kernels = df2.drop_duplicates(subset="kernel_name")[["kernel_name", "ms_per_call", "kernel_base"]]
+    rows = filtered.reset_index(drop=True).rename_axis("_row").reset_index()
+
+    # ---------- Exact match ----------
+    exact = rows.merge(
+        kernels.drop(columns="kernel_base"),
+        how="inner", left_on="s_name", right_on="kernel_name", validate="m:1",
+    )
+
+    # ---------- Fallback match ----------
+    # Greedy scan in row order: a row without an exact match takes the first
+    # kernel of its kernel_base (in kernel file order) that no earlier row used,
+    # whether that row matched exactly or by fallback. Exact matches do not
+    # depend on earlier rows, so only this scan is sequential. Kernels before a
+    # base's cursor are all used (the used set only grows), so each candidate
+    # list is walked once over the whole scan.
+    exact_kernel_by_row = dict(zip(exact["_row"].tolist(), exact["kernel_name"].tolist()))
+    candidates = {}
+    for name, base in zip(kernels["kernel_name"].tolist(), kernels["kernel_base"].tolist()):
+        candidates.setdefault(base, []).append(name)
+    cursor = dict.fromkeys(candidates, 0)
+    used = set()
+    fallback_rows = []
+    fallback_kernels = []
+    for row, base in zip(rows["_row"].tolist(), rows["kernel_base"].tolist()):
+        if row in exact_kernel_by_row:
+            used.add(exact_kernel_by_row[row])
             continue
-
-        # ---------- Try fallback match ----------
-        base = row["kernel_base"]
-        fallback = df2[(df2["kernel_base"] == base) & (~df2["kernel_name"].isin(used_kernels))]
-        if not fallback.empty:
-            match = fallback.iloc[0]
-            results.append({**row.to_dict(), **match.to_dict()})
-            matched_snames.add(s_name)
-            used_kernels.add(match["kernel_name"])
-
-    merged = pd.DataFrame(results)
+        names = candidates.get(base)
+        if names is None:
+            continue
+        i = cursor[base]
+        while i < len(names) and names[i] in used:
+            i += 1
+        if i < len(names):
+            used.add(names[i])
+            fallback_rows.append(row)
+            fallback_kernels.append(names[i])
+            i += 1
+        cursor[base] = i
+    fallback = (
+        rows.iloc[fallback_rows]
+        .assign(kernel_name=pd.Categorical(fallback_kernels, dtype=name_dtype))
+        .merge(kernels.drop(columns="kernel_base"), how="left", on="kernel_name", validate="m:1")
+    )
+
+    merged = pd.concat([exact, fallback]).sort_values("_row").drop(columns="_row").reset_index(drop=True)
 
     # ---------- Count unmatched ----------
     total_filtered = len(filtered)
@@ -71,12 +114,23 @@ def process_csv(csv1, csv2, threshold=100, output="test.csv"):
     if not merged.empty:
         total_sum_latency = filtered["sum_latency_mi350x"].sum() / 1000.0
 
-        merged["total_ms"] = merged["count_mi350x"] * merged["ms_per_call"]
-        total_sum_ms = merged["total_ms"].sum()
+        # count * ms_per_call per kernel, kept out of merged: only its total
+        # and per-pattern sums are used, so merged is not widened (and then
+        # sorted) with an extra column
+        total_ms = pd.Series(
+            merged["count_mi350x"].to_numpy() * merged["ms_per_call"].to_numpy(),
+            index=merged.index, name="total_ms",
+        )
+        total_sum_ms = total_ms.sum()
 
         # Assign patterns and compute sums
-        merged["pattern_group"] = merged["kernel_name"].apply(assign_pattern)
-        pattern_sums = merged.groupby("pattern_group")["total_ms"].sum().reset_index()
+        merged["pattern_group"] = (
+            merged["kernel_name"].astype(str)
+            .str.extract(_PATTERN_RE, expand=False)
+            .fillna("other")
+            .astype("category")
+        )
+        pattern_sums = total_ms.groupby(merged["pattern_group"], observed=True, sort=False).sum().reset_index()
 
         # Sort results by sum_latency_mi350x
         merged = merged.sort_values("sum_latency_mi350x", ascending=False)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import subprocess
+import sys
+
+
+INDUCTOR_SCRIPTS_DIR = Path(__file__).resolve().parent
+CONVERT_CONFIG = INDUCTOR_SCRIPTS_DIR / "convert_config.py"
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+convert_config = _load_module("framework_convert_config", CONVERT_CONFIG)
+
+
+def _config_line(kpack: str) -> str:
+    return (
+        "{'BLOCK_SIZE_M': 64, 'BLOCK_SIZE_N': 32, 'BLOCK_SIZE_K': 16, "
+        "'num_stages': 2, 'num_warps': 4, 'GROUP_SIZE_M': 8, "
+        f"'waves_per_eu': 0, 'kpack': {kpack}}}"
+    )
+
+
+def test_non_integer_values_are_reported_not_truncated(tmp_path):
+    input_path = tmp_path / "configs.txt"
+    input_path.write_text(
+        "\n".join(_config_line(v) for v in ("1", "1.5", "True")) + "\n",
+        encoding="utf-8",
+    )
+
+    completed = subprocess.run(
+        [sys.executable, str(CONVERT_CONFIG), str(input_path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.splitlines() == [
+        "            ROCmGemmConfig(64, 32, 16, 2, 4, group_m=8, waves_per_eu=0, kpack=1),",
+        "# ERROR: Could not parse line: Non-integer required fields: ['kpack=1.5']",
+        "# ERROR: Could not parse line: Non-integer required fields: ['kpack=True']",
+    ]
+    # Neither bad line may be mistaken for a duplicate of the 'kpack': 1 config.
+    assert "duplicate" not in completed.stderr
+
+
+def test_read_lines_frames_like_text_mode_iteration(monkeypatch):
+    import io
+
+    data = "a\x0cb c\x85d\r\ne\rf\n\ng".encode("utf-8")
+    # Tiny blocks split the '\r\n' and the multi-byte characters across reads.
+    monkeypatch.setattr(convert_config, "IO_BUFFER_SIZE", 3)
+
+    lines = list(convert_config.read_lines(io.BytesIO(data)))
+
+    text_mode = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    assert lines == [line.rstrip("\n") for line in text_mode]
+    assert lines == ["a\x0cb c\x85d", "e", "f", "", "g"]
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+import subprocess
+import sys
+
+import pandas as pd
+
+
+KERNEL_STATS = Path(__file__).resolve().parent / "kernel_stats.py"
+
+
+def test_nan_groups_keep_their_row_and_nan_percentiles(tmp_path):
+    input_path = tmp_path / "kernels.csv"
+    pd.DataFrame({
+        "relative_dir": "cache",
+        "kernel_name": [
+            "triton_poi_all_nan_1", "triton_poi_all_nan_1_ab12",
+            "triton_poi_mixed_2", "triton_poi_mixed_2_cd34", "triton_poi_mixed_2_ef56",
+            "triton_poi_clean_3", "triton_poi_clean_3_ab12",
+        ],
+        "ms_per_call": [float("nan"), float("nan"), 1.0, float("nan"), 3.0, 1.0, 2.0],
+        "gb_per_s": 1.0,
+    }).to_csv(input_path, index=False)
+    output_path = tmp_path / "stats.csv"
+
+    subprocess.run(
+        [sys.executable, str(KERNEL_STATS), str(input_path), "-o", str(output_path)],
+        check=True,
+    )
+    stats = pd.read_csv(output_path).set_index("base_name")
+
+    assert list(stats.index) == ["triton_poi_all_nan_1", "triton_poi_clean_3", "triton_poi_mixed_2"]
+
+    all_nan = stats.loc["triton_poi_all_nan_1"]
+    assert all_nan["count"] == 0
+    assert all(math.isnan(all_nan[c]) for c in ("p10", "mean", "p90", "p90_over_p10"))
+
+    # Like np.percentile, a NaN in the group makes its percentiles NaN; mean
+    # and count still skip the NaN.
+    mixed = stats.loc["triton_poi_mixed_2"]
+    assert mixed["count"] == 2
+    assert mixed["mean"] == 2.0
+    assert math.isnan(mixed["p10"]) and math.isnan(mixed["p90"])
+
+    clean = stats.loc["triton_poi_clean_3"]
+    assert clean["count"] == 2
+    assert math.isclose(clean["p10"], 1.1)
+    assert math.isclose(clean["p90"], 1.9)
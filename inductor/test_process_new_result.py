@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+
+INDUCTOR_SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+process_new_result = _load_module(
+    "framework_process_new_result",
+    INDUCTOR_SCRIPTS_DIR / "process_new_result.py",
+)
+
+
+def test_fallback_takes_first_kernel_unused_by_earlier_rows(tmp_path):
+    results = tmp_path / "results.csv"
+    pd.DataFrame({
+        "s_name": ["triton_poi_a_1", "triton_poi_a_2", "triton_poi_a_9", "triton_red_b_7"],
+        "sum_latency_mi350x": [400.0, 300.0, 200.0, 100.0],
+        "avg_latency_mi350x": [4000.0, 3000.0, 2000.0, 1000.0],
+        "count_mi350x": [1, 1, 1, 1],
+    }).to_csv(results, index=False)
+    kernels = tmp_path / "kernels.csv"
+    pd.DataFrame({
+        "kernel_name": ["triton_poi_a_2", "triton_poi_a_3", "triton_red_b_5"],
+        "ms_per_call": [2.0, 3.0, 5.0],
+    }).to_csv(kernels, index=False)
+
+    result, _, total_ms, _, unmatched_count = process_new_result.process_csv(
+        results, kernels, threshold=1.0, output=tmp_path / "out.csv"
+    )
+
+    # triton_poi_a_1 falls back to triton_poi_a_2 because no earlier row used
+    # it; the next row still matches triton_poi_a_2 exactly, and the third
+    # then falls back to the remaining triton_poi_a_3.
+    assert list(zip(result["s_name"].astype(str), result["kernel_name"].astype(str))) == [
+        ("triton_poi_a_1", "triton_poi_a_2"),
+        ("triton_poi_a_2", "triton_poi_a_2"),
+        ("triton_poi_a_9", "triton_poi_a_3"),
+        ("triton_red_b_7", "triton_red_b_5"),
+    ]
+    assert unmatched_count == 0
+    assert total_ms == 2.0 + 2.0 + 3.0 + 5.0
+    # Written by DataFrame.to_csv, so whole floats keep their trailing .0
+    assert (tmp_path / "out.csv").read_text().splitlines()[1] == (
+        "triton_poi_a_1,4.0,1,triton_poi_a_2,2.0"
+    )
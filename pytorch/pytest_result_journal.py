@@ -40,7 +40,8 @@ def _append_event(event: dict[str, object]) -> None:
 
 
 def _is_xfail(report) -> bool:
-    return bool(getattr(report, "wasxfail", False))
+    # wasxfail holds the xfail reason, which is "" for unittest expectedFailure.
+    return hasattr(report, "wasxfail")
 
 
 def _new_node_state() -> dict[str, object]:
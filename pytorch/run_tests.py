@@ -6,6 +6,8 @@ Script to run PyTorch inductor unit tests from a CSV file.
 import ast
 import copy
 import csv
+import hashlib
+import importlib.metadata
 import io
 import json
 import multiprocessing
@@ -45,6 +47,7 @@ TRITON_NIGHTLY_INDUCTOR_FILES = [
 
 _TORCH_VERSION_CACHE = None
 _TORCH_HIP_VERSION_CACHE = None
+_TEST_DEPS_VERIFIED = False
 _THE_ROCK_DEVEL_PATH = str(
     Path(sysconfig.get_path('purelib')) / '_rocm_sdk_devel'
 )
@@ -55,7 +58,7 @@ def _require_rocm_home():
     Return ROCM_HOME from the user environment.
     Raise RuntimeError if unset/empty because inductor tests require it.
     """
-    rocm_home = (subprocess.os.environ.get('ROCM_HOME') or '').strip()
+    rocm_home = (os.environ.get('ROCM_HOME') or '').strip()
     if not rocm_home:
         raise RuntimeError(
             "ROCM_HOME environment variable must be set to some value in your environment, "
@@ -143,7 +146,7 @@ def _test_rocm_home():
 def _build_test_env():
     """Build subprocess environment for inductor tests."""
     env = {
-        **subprocess.os.environ.copy(),
+        **os.environ,
         'PYTORCH_TEST_WITH_ROCM': '1',
         'HSA_FORCE_FINE_GRAIN_PCIE': '1',
         'HSA_TOOLS_DISABLE_REGISTER': '1',
@@ -172,7 +175,12 @@ def ensure_pytest_and_timeout_installed():
     """
     Verify that pytest, pytest-timeout, pytest-rerunfailures, and expecttest are installed (same interpreter as this script).
     Abort with a clear message if any are missing. Call before using pytest for discovery or execution.
+    The probe runs once per process; later calls return immediately.
     """
+    global _TEST_DEPS_VERIFIED
+    if _TEST_DEPS_VERIFIED:
+        return
+
     result = subprocess.run(
         [sys.executable, '-c', 'import pytest; import pytest_timeout; import pytest_rerunfailures; import expecttest'],
         capture_output=True,
@@ -186,22 +194,7 @@ def ensure_pytest_and_timeout_installed():
         if err:
             print(f"Details: {err}")
         sys.exit(1)
-
-
-class TeeOutput:
-    """Helper class to write to both console and log file."""
-    def __init__(self, log_file):
-        self.log_file = log_file
-        self.terminal = sys.stdout
-        
-    def write(self, message):
-        self.terminal.write(message)
-        self.log_file.write(message)
-        self.log_file.flush()
-        
-    def flush(self):
-        self.terminal.flush()
-        self.log_file.flush()
+    _TEST_DEPS_VERIFIED = True
 
 
 # Test outcome states (each test has exactly one)
@@ -213,10 +206,20 @@ STATE_FAILED = "failed"
 STATE_TIMEDOUT = "timedout"
 STATE_MISSED = "missed"
 DISCOVERY_TIMEOUT_SECONDS = 1800
+DISCOVERY_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'run_tests'
+DISCOVERY_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+# Environment variables that can change what pytest collects; part of the cache key.
+DISCOVERY_CACHE_ENV_PREFIXES = ('PYTORCH_', 'TORCH', 'HIP_', 'CUDA_', 'ROCM', 'PYTHONPATH')
+# Checkout paths whose uncommitted changes can affect collection; part of the cache key.
+DISCOVERY_CACHE_GIT_PATHS = ('test', 'torch/testing')
 DEFAULT_PER_TEST_TIMEOUT_SECONDS = 300
 DEFAULT_PER_FILE_TIMEOUT_SECONDS = 43200
 FRESH_PROCESS_TIMEOUT_GRACE_SECONDS = 60
+# Run logs flush explicitly at test and batch boundaries; let the OS buffer
+# absorb the many small message writes in between.
+LOG_BUFFER_SIZE = 1 << 16
 DEFAULT_SHARD_SIZE = 100
+DEFAULT_CHECKPOINT_INTERVAL = 10
 BATCH_MODE_FILE = "file"
 BATCH_MODE_SHARD = "shard"
 BATCH_MODE_TEST = "test"
@@ -224,6 +227,15 @@ DEFAULT_SHARDED_FILE_SUFFIXES = ("test/inductor/test_torchinductor_opinfo.py",)
 UNKNOWN_TIMEOUT_MISS_LIMIT = 4
 RESULT_JOURNAL_ENV = "FRAMEWORK_SCRIPTS_RESULT_JOURNAL"
 RESULT_JOURNAL_PLUGIN = "pytest_result_journal"
+RESULT_JOURNAL_PLUGIN_DIR = str(Path(__file__).resolve().parent)
+
+
+def _emit(log_file, msg, flush=False):
+    """Print msg to the console and append it to log_file (flushed if requested)."""
+    print(msg, end='')
+    log_file.write(msg)
+    if flush:
+        log_file.flush()
 
 
 def _now_iso():
@@ -247,46 +259,119 @@ def _signal_name_from_returncode(returncode):
         return f"signal {signal_number}"
 
 
-def _output_indicates_xfailed(stdout: str, stderr: str) -> bool:
+_XFAILED_COUNT_RE = re.compile(r"\d+\s+xfailed")
+_XPASSED_COUNT_RE = re.compile(r"\d+\s+xpassed")
+_SKIPPED_COUNT_RE = re.compile(r"\d+\s+skipped")
+
+
+def _has_count(text, word, count_re):
+    """True if text has a pytest summary count such as '2 skipped'."""
+    # The substring test is far cheaper than the regex and rules out most output.
+    return word in text and count_re.search(text) is not None
+
+
+# Substrings classification looks for anywhere in a test's output. Per-test
+# runs scan the whole streamed output for them in chunks (_scan_output_markers);
+# only pytest's summary counts below are read from the bounded tail, since the
+# summary line is the last thing pytest prints.
+OUTPUT_MARKERS = ("Timeout", "RuntimeError", " XPASS", " XFAIL", " SKIPPED", "skipped=", "OK")
+
+
+def _output_markers(text):
+    """Return the OUTPUT_MARKERS that occur in text."""
+    return {m for m in OUTPUT_MARKERS if m in text}
+
+
+def _output_indicates_xfailed(markers, tail: str) -> bool:
     """True if pytest output indicates an expected failure."""
-    combined = (stdout or "") + "\n" + (stderr or "")
-    return " XFAIL" in combined or re.search(r"\d+\s+xfailed", combined)
+    return " XFAIL" in markers or _has_count(tail, "xfailed", _XFAILED_COUNT_RE)
 
 
-def _output_indicates_xpassed(stdout: str, stderr: str) -> bool:
+def _output_indicates_xpassed(markers, tail: str) -> bool:
     """True if pytest output indicates an unexpected pass."""
-    combined = (stdout or "") + "\n" + (stderr or "")
-    return " XPASS" in combined or re.search(r"\d+\s+xpassed", combined)
+    return " XPASS" in markers or _has_count(tail, "xpassed", _XPASSED_COUNT_RE)
 
 
-def _output_indicates_skipped(stdout: str, stderr: str) -> bool:
+def _output_indicates_skipped(markers, tail: str) -> bool:
     """
-    Parse captured stdout/stderr to detect if the test was skipped (vs passed).
+    Detect from output markers and the summary tail whether the test was skipped (vs passed).
     Handles pytest (e.g. 'SKIPPED', '1 skipped') and unittest (e.g. 'OK (skipped=1)').
     """
-    combined = (stdout or "") + "\n" + (stderr or "")
     # Pytest: "test_foo SKIPPED" or summary "1 passed, 1 skipped" / "1 skipped"
-    if " SKIPPED" in combined or re.search(r"\d+\s+skipped", combined):
+    if " SKIPPED" in markers or _has_count(tail, "skipped", _SKIPPED_COUNT_RE):
         return True
     # Unittest: "OK (skipped=1)" or "Ran 1 test ... OK (skipped=1)"
-    if "skipped=" in combined and "OK" in combined:
-        return True
-    return False
+    return "skipped=" in markers and "OK" in markers
 
 
-def _output_indicates_runtime_error(stdout: str, stderr: str) -> bool:
-    """True if stdout/stderr contain RuntimeError (non-zero exit → classify as ERROR)."""
-    combined = (stdout or "") + "\n" + (stderr or "")
-    return "RuntimeError" in combined
+def _output_indicates_runtime_error(markers) -> bool:
+    """True if the output contains RuntimeError (non-zero exit → classify as ERROR)."""
+    return "RuntimeError" in markers
 
 
-def _output_indicates_timeout(stdout: str, stderr: str) -> bool:
-    """True if stdout/stderr indicate pytest-timeout fired (classify as TIMEDOUT)."""
-    combined = (stdout or "") + "\n" + (stderr or "")
-    return "TimeoutExpired" in combined or "Timeout" in combined
+def _output_indicates_timeout(markers) -> bool:
+    """True if the output indicates pytest-timeout fired (classify as TIMEDOUT)."""
+    # "Timeout" also covers "TimeoutExpired".
+    return "Timeout" in markers
 
 
-def run_test(test_name, pytorch_path, log_file, timeout=300, by_id=False, attempt=None, total_attempts=None):
+def _with_result_journal(env, journal_path):
+    """Return a copy of env that loads the result-journal plugin, writing to journal_path."""
+    env = dict(env)
+    env[RESULT_JOURNAL_ENV] = str(journal_path)
+    existing_pythonpath = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = RESULT_JOURNAL_PLUGIN_DIR + (
+        os.pathsep + existing_pythonpath if existing_pythonpath else ""
+    )
+    return env
+
+
+def _classify_single_run(returncode, output, journal_results, markers=None):
+    """
+    Return the state of a per-test pytest run.
+
+    Node outcomes come from the result journal when pytest recorded any. The
+    journal only knows a node failed, so pytest-timeout and RuntimeError are
+    still told apart from output. Without journal records (collection errors,
+    crashes before the first node) fall back to scanning output.
+
+    markers are the OUTPUT_MARKERS found anywhere in the run's output; when
+    None they are taken from output, which then must be the whole output.
+    Otherwise output only needs to hold pytest's final summary line.
+    """
+    if markers is None:
+        markers = _output_markers(output)
+    if journal_results:
+        states = {r['state'] for r in journal_results}
+        if returncode == 0:
+            # A passing exit with a failed node is a non-strict XPASS.
+            if STATE_FAILED in states or STATE_ERROR in states:
+                return STATE_FAILED
+            if STATE_XFAILED in states:
+                return STATE_XFAILED
+            if STATE_SKIPPED in states:
+                return STATE_SKIPPED
+            return STATE_PASSED
+        if _output_indicates_timeout(markers):
+            return STATE_TIMEDOUT
+        if STATE_ERROR in states or _output_indicates_runtime_error(markers):
+            return STATE_ERROR
+        return STATE_FAILED
+
+    if _output_indicates_xpassed(markers, output):
+        return STATE_FAILED
+    if returncode == 0:
+        if _output_indicates_xfailed(markers, output):
+            return STATE_XFAILED
+        if _output_indicates_skipped(markers, output):
+            return STATE_SKIPPED
+        return STATE_PASSED
+    if _output_indicates_timeout(markers):
+        return STATE_TIMEDOUT
+    return STATE_ERROR if _output_indicates_runtime_error(markers) else STATE_FAILED
+
+
+def run_test(test_name, pytorch_path, log_file, timeout=300, by_id=False, attempt=None, total_attempts=None, env=None):
     """
     Run a single test with the specified test name.
 
@@ -295,149 +380,127 @@ def run_test(test_name, pytorch_path, log_file, timeout=300, by_id=False, attemp
                    (e.g. path::Class::test_method or path::Class::test_method[param]); we run
                    pytest with that node id for 1:1 mapping. When by_id=False, pass as -k <test_name>.
         pytorch_path: Path to PyTorch directory
-        log_file: File object to write logs to
+        log_file: File object to write logs to. The trailing status line is left for
+                  the caller to flush (once per test, after any retries).
         timeout: Timeout in seconds for this test (default 300)
         by_id: If True, test_name is a full pytest node id; run pytest <node_id> from pytorch_path.
+        env: Subprocess environment from _build_test_env(); built here when None.
+             Batch callers build it once and pass it to every test.
 
     Returns:
         dict with success, elapsed_time, timed_out, state, returncode, and signal_name.
         state is one of STATE_PASSED, STATE_SKIPPED, STATE_XFAILED, STATE_ERROR,
         STATE_FAILED, STATE_TIMEDOUT.
     """
-    test_file = Path(pytorch_path) / TEST_FILE_REL_PATH
-
     if by_id:
         # Full-suite/CSV node-id mode: test_name is a full pytest node id.
         # Per-test timeout is handled via pytest-timeout.
-        cmd = ['pytest', '--timeout', str(timeout), test_name]
+        cmd = ['pytest', '-p', RESULT_JOURNAL_PLUGIN, '--timeout', str(timeout), test_name]
     else:
         # Legacy keyword mode: run pytest with -k and per-test timeout.
-        cmd = ['pytest', TEST_FILE_REL_PATH, '-k', test_name, '--timeout', str(timeout)]
+        cmd = ['pytest', '-p', RESULT_JOURNAL_PLUGIN, TEST_FILE_REL_PATH, '-k', test_name, '--timeout', str(timeout)]
 
-    env = _build_test_env()
+    if env is None:
+        env = _build_test_env()
     
     attempt_suffix = ""
     if attempt is not None and total_attempts is not None:
         attempt_suffix = f"\nAttempt: {attempt}/{total_attempts}"
     header = f"\n{'='*70}\nRunning: {test_name}{attempt_suffix}\n{'='*70}\n"
-    print(header, end='')
-    log_file.write(header)
+    _emit(log_file, header)
+    # The child writes to the same file; flush buffered text before spawning it.
     log_file.flush()
     
-    start_time = time.time()
+    output_start_offset = log_file.tell()
+
+    start_time = time.perf_counter()
     # pytest-timeout should interrupt test-level hangs; the subprocess timeout is
     # a final safety net for cases where the test process does not exit cleanly.
+    # Output is streamed straight into the log (as in file-batch mode) so long,
+    # verbose tests are not buffered in memory; classification reads it back.
+    # The result journal records each node's pytest outcome for classification.
+    # stdin is /dev/null so a stray input()/breakpoint() fails fast instead of
+    # blocking on the runner's terminal until the timeout.
     run_kw = dict(
-        env=env,
-        capture_output=True,
-        text=True,
+        stdin=subprocess.DEVNULL,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
         cwd=str(pytorch_path),
         timeout=timeout + 60,
     )
 
-    try:
-        result = subprocess.run(cmd, **run_kw)
-        
-        elapsed_time = time.time() - start_time
-        stdout_str = result.stdout or ""
-        stderr_str = result.stderr or ""
-        timed_out = False
-        signal_name = _signal_name_from_returncode(result.returncode)
-
-        if signal_name:
-            state = STATE_FAILED
-        elif _output_indicates_xpassed(stdout_str, stderr_str):
-            state = STATE_FAILED
-        elif result.returncode == 0:
-            if _output_indicates_xfailed(stdout_str, stderr_str):
-                state = STATE_XFAILED
-            elif _output_indicates_skipped(stdout_str, stderr_str):
-                state = STATE_SKIPPED
-            else:
-                state = STATE_PASSED
-        else:
-            if _output_indicates_timeout(stdout_str, stderr_str):
-                state = STATE_TIMEDOUT
-                timed_out = True
-            else:
-                state = STATE_ERROR if _output_indicates_runtime_error(stdout_str, stderr_str) else STATE_FAILED
-        success = _is_success_state(state)
-
-        # Write all output to log file
-        if result.stdout:
-            log_file.write(result.stdout)
-        if result.stderr:
-            log_file.write(result.stderr)
-        log_file.flush()
+    with tempfile.TemporaryDirectory(prefix="run_tests_journal_") as tmpdir:
+        journal_path = Path(tmpdir) / "results.jsonl"
+        try:
+            result = subprocess.run(cmd, env=_with_result_journal(env, journal_path), **run_kw)
 
-        # Print status to console.
-        status_map = {
-            STATE_PASSED: "✓ PASSED",
-            STATE_SKIPPED: "✓ SKIPPED",
-            STATE_XFAILED: "✓ XFAILED",
-            STATE_ERROR: "✗ ERROR",
-            STATE_FAILED: "✗ FAILED",
-            STATE_TIMEDOUT: "✗ TIMEDOUT",
-            STATE_MISSED: "✗ MISSED",
-        }
-        status = status_map[state]
-        status_msg = f"{status} ({elapsed_time:.2f}s)\n"
-        if signal_name:
-            status_msg = f"{status} ({elapsed_time:.2f}s, signal: {signal_name})\n"
-        print(status_msg, end='')
-        log_file.write(status_msg)
-        log_file.flush()
+            elapsed_time = time.perf_counter() - start_time
+            signal_name = _signal_name_from_returncode(result.returncode)
 
-        return {
-            'success': success,
-            'elapsed_time': elapsed_time,
-            'timed_out': timed_out,
-            'state': state,
-            'returncode': result.returncode,
-            'signal_name': signal_name,
-        }
+            if signal_name:
+                state = STATE_FAILED
+            else:
+                journal_results, _ = _parse_result_journal(journal_path)
+                state = _classify_single_run(
+                    result.returncode,
+                    _read_log_tail_from(log_file, output_start_offset),
+                    journal_results,
+                    markers=_scan_output_markers(log_file, output_start_offset),
+                )
+            timed_out = state == STATE_TIMEDOUT
+            success = _is_success_state(state)
+
+            # Print status to console.
+            status_map = {
+                STATE_PASSED: "✓ PASSED",
+                STATE_SKIPPED: "✓ SKIPPED",
+                STATE_XFAILED: "✓ XFAILED",
+                STATE_ERROR: "✗ ERROR",
+                STATE_FAILED: "✗ FAILED",
+                STATE_TIMEDOUT: "✗ TIMEDOUT",
+                STATE_MISSED: "✗ MISSED",
+            }
+            status = status_map[state]
+            status_msg = f"{status} ({elapsed_time:.2f}s)\n"
+            if signal_name:
+                status_msg = f"{status} ({elapsed_time:.2f}s, signal: {signal_name})\n"
+            _emit(log_file, status_msg)
+
+            return {
+                'success': success,
+                'elapsed_time': elapsed_time,
+                'timed_out': timed_out,
+                'state': state,
+                'returncode': result.returncode,
+                'signal_name': signal_name,
+            }
 
-    except subprocess.TimeoutExpired as e:
-        elapsed_time = time.time() - start_time
-        timeout_msg = f"✗ TIMEOUT after {elapsed_time:.2f}s (limit: {timeout}s)\n"
-        print(timeout_msg, end='')
-        log_file.write(timeout_msg)
-        
-        # Write any captured output before timeout (may be bytes or str depending on Python/env)
-        try:
-            if e.stdout:
-                out = e.stdout.decode() if isinstance(e.stdout, bytes) else e.stdout
-                log_file.write(out)
-            if e.stderr:
-                err = e.stderr.decode() if isinstance(e.stderr, bytes) else e.stderr
-                log_file.write(err)
-        except (AttributeError, TypeError):
-            pass
-        log_file.flush()
+        except subprocess.TimeoutExpired:
+            elapsed_time = time.perf_counter() - start_time
+            timeout_msg = f"✗ TIMEOUT after {elapsed_time:.2f}s (limit: {timeout}s)\n"
+            _emit(log_file, timeout_msg)
 
-        return {
-            'success': False,
-            'elapsed_time': elapsed_time,
-            'timed_out': True,
-            'state': STATE_TIMEDOUT,
-            'returncode': None,
-            'signal_name': None,
-        }
+            return {
+                'success': False,
+                'elapsed_time': elapsed_time,
+                'timed_out': True,
+                'state': STATE_TIMEDOUT,
+                'returncode': None,
+                'signal_name': None,
+            }
 
-    except Exception as e:
-        elapsed_time = time.time() - start_time
-        error_msg = f"✗ ERROR: {str(e)}\n"
-        print(error_msg, end='')
-        log_file.write(error_msg)
-        log_file.flush()
-        return {
-            'success': False,
-            'elapsed_time': elapsed_time,
-            'timed_out': False,
-            'state': STATE_ERROR,
-            'returncode': None,
-            'signal_name': None,
-        }
+        except Exception as e:
+            elapsed_time = time.perf_counter() - start_time
+            error_msg = f"✗ ERROR: {str(e)}\n"
+            _emit(log_file, error_msg)
+            return {
+                'success': False,
+                'elapsed_time': elapsed_time,
+                'timed_out': False,
+                'state': STATE_ERROR,
+                'returncode': None,
+                'signal_name': None,
+            }
 
 
 def _node_file(node_id: str) -> str:
@@ -482,9 +545,10 @@ def _load_pytorch_serial_test_names(pytorch_path):
     files. The tests inside that file may still run using that file's own batch
     mode.
     """
-    pytorch_root = Path(pytorch_path)
-    run_test_path = pytorch_root / "test" / "run_test.py"
-    if not run_test_path.exists():
+    run_test_path = Path(pytorch_path) / "test" / "run_test.py"
+    try:
+        source = run_test_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
         return set()
 
     def collect_strings(node):
@@ -498,7 +562,7 @@ def _load_pytorch_serial_test_names(pytorch_path):
             return collect_strings(node.left) + collect_strings(node.right)
         return []
 
-    tree = ast.parse(run_test_path.read_text(encoding='utf-8'))
+    tree = ast.parse(source)
     serial_names = set()
     for node in tree.body:
         if not isinstance(node, ast.Assign):
@@ -741,18 +805,13 @@ def _write_result_status(log_file, state, elapsed):
         STATE_MISSED: "✗ MISSED",
     }
     status_msg = f"{status_map[state]} ({elapsed:.2f}s)\n"
-    print(status_msg, end='')
-    log_file.write(status_msg)
-    log_file.flush()
+    _emit(log_file, status_msg, flush=True)
 
 
 def _record_file_batch_result(node_id, state, elapsed, log_file, index, total):
     progress_msg = f"[{index}/{total}] "
     header = f"\n{'='*70}\nRunning: {node_id}\n{'='*70}\n"
-    print(progress_msg, end='')
-    print(header, end='')
-    log_file.write(progress_msg)
-    log_file.write(header)
+    _emit(log_file, progress_msg + header)
     _write_result_status(log_file, state, elapsed)
     return {
         'name': node_id,
@@ -790,6 +849,40 @@ def _read_log_tail_from(log_file, start_offset, max_bytes=1_000_000):
         return ""
 
 
+def _scan_output_markers(log_file, start_offset, chunk_size=1 << 20):
+    """
+    Return the OUTPUT_MARKERS found anywhere in log_file after start_offset.
+
+    Unlike _read_log_tail_from this covers all of a test's streamed output, but
+    reads it in chunk_size pieces (overlapping by the longest marker) so a very
+    verbose test is never held in memory at once.
+    """
+    pending = {m: m.encode() for m in OUTPUT_MARKERS}
+    overlap = max(len(b) for b in pending.values()) - 1
+    found = set()
+    try:
+        log_file.flush()
+        path = getattr(log_file, "name", None)
+        if not path:
+            return found
+        with open(path, "rb") as f:
+            f.seek(start_offset)
+            carry = b""
+            while pending:
+                block = f.read(chunk_size)
+                if not block:
+                    break
+                data = carry + block
+                for marker, encoded in list(pending.items()):
+                    if encoded in data:
+                        found.add(marker)
+                        del pending[marker]
+                carry = data[-overlap:]
+    except OSError:
+        pass
+    return found
+
+
 def _new_stepcurrent_key():
     """Return a unique key for PyTorch's pytest step-current plugin."""
     return f"framework_scripts_{os.getpid()}_{time.time_ns()}"
@@ -828,13 +921,7 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
     with tempfile.TemporaryDirectory(prefix="run_tests_junit_") as tmpdir:
         junit_path = Path(tmpdir) / "pytest.xml"
         journal_path = Path(tmpdir) / "results.jsonl"
-        env[RESULT_JOURNAL_ENV] = str(journal_path)
-        plugin_path = str(Path(__file__).resolve().parent)
-        existing_pythonpath = env.get("PYTHONPATH")
-        env["PYTHONPATH"] = (
-            plugin_path
-            + (os.pathsep + existing_pythonpath if existing_pythonpath else "")
-        )
+        env = _with_result_journal(env, journal_path)
         stepcurrent_key = _new_stepcurrent_key()
         cmd = [
             'pytest',
@@ -854,28 +941,25 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
             f"Running file batch: {file_name} ({len(node_ids)} collected test(s))\n"
             f"{'='*70}\n"
         )
-        print(header, end='')
-        log_file.write(header)
-        log_file.flush()
+        _emit(log_file, header, flush=True)
         output_start_offset = log_file.tell()
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = subprocess.run(
                 cmd,
                 env=env,
+                stdin=subprocess.DEVNULL,
                 stdout=log_file,
                 stderr=subprocess.STDOUT,
                 cwd=str(args.pytorch_path),
                 timeout=effective_process_timeout,
             )
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
         except subprocess.TimeoutExpired as e:
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             msg = f"✗ FILE TIMEDOUT ({file_name}) after {elapsed:.2f}s (limit: {effective_process_timeout}s)\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
             output = _read_log_tail_from(log_file, output_start_offset)
             journal_results, journal_active_node = _parse_result_journal(
                 journal_path
@@ -908,9 +992,7 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
             output = _read_log_tail_from(log_file, output_start_offset)
             if testcase_states:
                 msg = f"✗ FILE FAILED ({file_name}) with exit code {result.returncode} ({elapsed:.2f}s)\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
                 junit_results, _, _, _ = _build_file_results(
                     node_ids,
                     testcase_states,
@@ -937,7 +1019,7 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
                 ) or journal_active_node
                 reason = (
                     "timeout"
-                    if failed_node and _output_indicates_timeout(output, "")
+                    if failed_node and _output_indicates_timeout(_output_markers(output))
                     else "failure"
                 )
                 if reason == "timeout":
@@ -948,9 +1030,7 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
                             break
                 return partial_results, reason, elapsed, failed_node
             msg = f"✗ FILE FAILED ({file_name}) with exit code {result.returncode} ({elapsed:.2f}s); no JUnit results available.\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
             partial_results = _merge_partial_results(
                 node_ids,
                 _parse_verbose_node_results(output),
@@ -964,7 +1044,7 @@ def _run_file_batch(file_name, node_ids, args, log_file, process_timeout=None):
                 failed_node = running_nodes[-1] if running_nodes else None
             reason = (
                 "timeout"
-                if failed_node and _output_indicates_timeout(output, "")
+                if failed_node and _output_indicates_timeout(_output_markers(output))
                 else "crash"
             )
             if reason == "timeout":
@@ -985,9 +1065,7 @@ def _build_file_results(node_ids, testcase_states, file_name, log_file, elapsed,
     if (missing_count or extra_cases) and not allow_partial:
         msg = f"JUnit result mismatch ({file_name}): "
         msg += f"{missing_count} discovered node(s) missing, {len(extra_cases)} extra testcase(s).\n"
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg, flush=True)
 
     results = []
     for node_id, state, test_elapsed in matched:
@@ -1009,6 +1087,15 @@ def _build_file_results(node_ids, testcase_states, file_name, log_file, elapsed,
 # Pytest node ID line (from --collect-only -q): path::Class::test_method or path::test_method[param]
 # Path can be relative (e.g. test/inductor/test_torchinductor.py). Param part may contain - and other chars.
 _NODE_ID_LINE_RE = re.compile(r'^[\w/.-]+::.+$')
+# Same shape, applied to whole collect output in one pass. Summary lines such
+# as "collected N items" or "Running N items" have a space before any "::",
+# so they can never match. Lines end at every str.splitlines() boundary
+# (\r, \x0c, \u2028, ...), not just \n, and are stripped like str.strip().
+_LINE_BOUNDARY_CHARS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_NODE_ID_LINES_RE = re.compile(
+    rf'(?:^|(?<=[{_LINE_BOUNDARY_CHARS}]))[^\S{_LINE_BOUNDARY_CHARS}]*'
+    rf'([\w/.-]+::[^{_LINE_BOUNDARY_CHARS}]*\S)'
+)
 
 
 # Regex to parse "collected N items" from pytest --collect-only output
@@ -1091,17 +1178,7 @@ def _parse_pytest_collect_only_quiet(combined_output: str):
     for 1:1 mapping: each collected item is run exactly once.
     Skips non-node lines (e.g. "collected N items", "Running N items in this shard").
     """
-    lines = (combined_output or '').strip().splitlines()
-    node_ids = []
-    for line in lines:
-        s = line.strip()
-        if not s:
-            continue
-        if s.lower().startswith('collected ') or s.lower().startswith('running '):
-            continue
-        if _NODE_ID_LINE_RE.match(s):
-            node_ids.append(s)
-    return node_ids
+    return _NODE_ID_LINES_RE.findall(combined_output or '')
 
 
 def _format_discovery_failure(cmd, returncode, stdout, stderr):
@@ -1120,7 +1197,104 @@ def _format_discovery_failure(cmd, returncode, stdout, stderr):
     return msg
 
 
-def discover_tests(pytorch_path, log_file, test_file_rel_paths=None):
+def _checkout_git_state(pytorch_path):
+    """
+    Return the checkout's HEAD commit plus its uncommitted changes under
+    DISCOVERY_CACHE_GIT_PATHS as bytes, or None if git cannot report them.
+    """
+    commands = [
+        ['git', 'rev-parse', 'HEAD'],
+        # Names of modified and untracked files, then the content of the edits
+        # so repeated edits to an already-modified helper change the key too.
+        ['git', 'status', '--porcelain', '--untracked-files=all', '--', *DISCOVERY_CACHE_GIT_PATHS],
+        ['git', 'diff', 'HEAD', '--binary', '--', *DISCOVERY_CACHE_GIT_PATHS],
+    ]
+    state = []
+    for cmd in commands:
+        try:
+            result = subprocess.run(
+                cmd, cwd=str(pytorch_path), capture_output=True, timeout=60,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        state.append(result.stdout)
+    return b'\0'.join(state)
+
+
+def _discovery_cache_path(pytorch_path, test_paths, env):
+    """
+    Return the cache file for this discovery, or None if it cannot be keyed.
+
+    The key hashes the contents of each test file and test/conftest.py along
+    with the checkout path, the installed torch and pytest versions, and
+    collection-relevant environment variables. Parametrization also depends on
+    helper modules the test files import (torch/testing/_internal, test/*_utils.py),
+    so the checkout's git HEAD and its uncommitted changes under
+    DISCOVERY_CACHE_GIT_PATHS are part of the key too. A checkout whose git
+    state cannot be read is not cached.
+
+    File contents are hashed rather than mtimes, so touching a file without
+    changing it still hits. The key is not complete: helpers outside the checkout
+    (for example an installed torch rebuilt without a version change) can leave
+    a cached entry stale until it expires; --no-discover-cache re-collects.
+    """
+    git_state = _checkout_git_state(pytorch_path)
+    if git_state is None:
+        return None
+    try:
+        pytest_version = importlib.metadata.version('pytest')
+    except importlib.metadata.PackageNotFoundError:
+        pytest_version = ''
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(git_state + b'\0')
+    for part in [str(Path(pytorch_path).resolve()), _installed_torch_version(), pytest_version]:
+        digest.update(part.encode('utf-8') + b'\0')
+    conftest = Path(pytorch_path) / 'test' / 'conftest.py'
+    for path in [*test_paths, conftest]:
+        digest.update(str(path).encode('utf-8') + b'\0')
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError:
+            if path != conftest:
+                return None
+        digest.update(b'\0')
+    for k, v in sorted(env.items()):
+        if k.startswith(DISCOVERY_CACHE_ENV_PREFIXES):
+            digest.update(f"{k}={v}".encode('utf-8') + b'\0')
+    return DISCOVERY_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+
+def _read_discovery_cache(cache_path):
+    """Return cached node ids if the entry exists and is fresh, else None."""
+    try:
+        if time.time() - cache_path.stat().st_mtime > DISCOVERY_CACHE_MAX_AGE_SECONDS:
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            node_ids = json.load(f).get('node_ids')
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(node_ids, list) or not node_ids:
+        return None
+    return node_ids
+
+
+def _write_discovery_cache(cache_path, node_ids):
+    """Write discovered node ids atomically; cache failures never fail discovery."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'node_ids': node_ids}, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def discover_tests(pytorch_path, log_file, test_file_rel_paths=None, use_cache=True):
     """
     Discover tests by running pytest --collect-only -q (one node id per line).
     Returns full pytest node ids for 1:1 mapping: each collected item is run
@@ -1131,6 +1305,10 @@ def discover_tests(pytorch_path, log_file, test_file_rel_paths=None):
         log_file: File object to write logs to.
         test_file_rel_paths: Optional list of relative paths (under pytorch_path) for test files.
                              If None, uses [TEST_FILE_REL_PATH].
+        use_cache: If True, reuse a fresh on-disk result for the same inputs
+                   (see _discovery_cache_path) and cache a new one. If False,
+                   always collect and leave the cache alone, so the git and
+                   file hashing behind the cache key is skipped too.
 
     Returns:
         list: List of full pytest node ids (e.g. path::Class::test_method or path::Class::test_method[param])
@@ -1140,6 +1318,13 @@ def discover_tests(pytorch_path, log_file, test_file_rel_paths=None):
     test_paths = [str(Path(pytorch_path) / p) for p in test_file_rel_paths]
     cmd = ['pytest'] + test_paths + ['--collect-only', '-q']
     env = _build_test_env()
+    cache_path = _discovery_cache_path(pytorch_path, test_paths, env) if use_cache else None
+    if cache_path is not None:
+        node_ids = _read_discovery_cache(cache_path)
+        if node_ids is not None:
+            msg = f"Using cached test discovery ({len(node_ids)} test(s)): {cache_path}\n"
+            _emit(log_file, msg, flush=True)
+            return node_ids
     try:
         result = subprocess.run(
             cmd,
@@ -1153,26 +1338,22 @@ def discover_tests(pytorch_path, log_file, test_file_rel_paths=None):
             msg = _format_discovery_failure(
                 cmd, result.returncode, result.stdout or "", result.stderr or ""
             )
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
             return []
         combined = (result.stdout or '') + '\n' + (result.stderr or '')
         node_ids = _parse_pytest_collect_only_quiet(combined)
+        if node_ids and cache_path is not None:
+            _write_discovery_cache(cache_path, node_ids)
         return node_ids
     except subprocess.TimeoutExpired as e:
         stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
         stderr = e.stderr.decode() if isinstance(e.stderr, bytes) else (e.stderr or "")
         msg = _format_discovery_failure(cmd, "timeout", stdout, stderr)
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg, flush=True)
         return []
     except Exception as e:
         msg = f"Discovery error: {e}\nCommand: {' '.join(cmd)}\n"
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg, flush=True)
         return []
 
 
@@ -1181,8 +1362,82 @@ def checkpoint_path(log_file_path):
     return str(Path(log_file_path).with_suffix(Path(log_file_path).suffix + '.checkpoint'))
 
 
+def summary_sidecar_path(log_file_path):
+    """Return path to the machine-readable summary written next to a run log."""
+    return str(Path(log_file_path).with_suffix(Path(log_file_path).suffix + '.summary.jsonl'))
+
+
+def _append_summary_record(log_file, mode, summary_title, by_state):
+    """
+    Append this summary's rerun-relevant lists to the log's summary sidecar.
+
+    One JSON line per summary, mirroring the text log: resumed runs append to
+    the log, so they append here too. Sidecar errors never fail the run.
+    """
+    log_path = getattr(log_file, 'name', None)
+    if not isinstance(log_path, str):
+        return
+    record = {
+        'mode': mode,
+        'title': summary_title,
+        'failed': [r['name'] for r in by_state[STATE_FAILED]],
+        'timed_out': [r['name'] for r in by_state[STATE_TIMEDOUT]],
+        'missed': [r['name'] for r in by_state[STATE_MISSED]],
+    }
+    try:
+        with open(summary_sidecar_path(log_path), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    except OSError:
+        pass
+
+
+def _read_summary_sidecar(log_path):
+    """
+    Return (failed, timed_out, mode) from a log's summary sidecar, or None
+    if there is no usable sidecar (e.g. logs from older runs).
+    """
+    try:
+        f = open(summary_sidecar_path(log_path), 'r', encoding='utf-8')
+    except OSError:
+        return None
+    mode = None
+    failed_tests = []
+    timeout_tests = []
+    found = False
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            found = True
+            if mode is None and record.get('mode') in ('full_suite', 'csv'):
+                mode = record['mode']
+            failed = list(record.get('failed') or [])
+            timed_out = list(record.get('timed_out') or [])
+            # The text parser folds the "Missed tests:" list into whichever of
+            # the Failed / Timed out sections precedes it; keep the same result.
+            missed = record.get('missed') or []
+            if timed_out:
+                timed_out.extend(missed)
+            elif failed:
+                failed.extend(missed)
+            failed_tests.extend(failed)
+            timeout_tests.extend(timed_out)
+    if not found:
+        return None
+    return failed_tests, timeout_tests, mode
+
+
 def write_checkpoint(log_file_path, last_test, next_test, last_index, total, mode, csv_file=None, pytorch_path=None):
-    """Write checkpoint after each test so runs can be resumed. On by default."""
+    """
+    Write checkpoint so runs can be resumed. On by default.
+
+    The JSON is written to a temporary file and renamed over the checkpoint, so
+    an interrupted write never leaves a truncated checkpoint behind.
+    """
     path = checkpoint_path(log_file_path)
     data = {
         'last_test': last_test,
@@ -1194,23 +1449,73 @@ def write_checkpoint(log_file_path, last_test, next_test, last_index, total, mod
         'pytorch_path': pytorch_path,
         'updated': datetime.now().isoformat(),
     }
+    tmp_path = path + '.tmp'
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
     except OSError:
         pass
 
 
 def read_checkpoint(log_file_path):
     """Read checkpoint if it exists. Returns dict or None."""
-    path = checkpoint_path(log_file_path)
     try:
-        if Path(path).exists():
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        with open(checkpoint_path(log_file_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
     except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _remove_file_quietly(path):
+    """Remove path if present; errors are ignored."""
+    try:
+        os.unlink(path)
+    except OSError:
         pass
-    return None
+
+
+def remove_checkpoint(log_file_path):
+    """Remove the checkpoint for this log file if present; errors are ignored."""
+    _remove_file_quietly(checkpoint_path(log_file_path))
+
+
+def _make_checkpoint_recorder(args, test_names, mode):
+    """
+    Return (record, flush) for per-test checkpointing over test_names.
+
+    record(index) marks test_names[index] as done and writes the checkpoint every
+    --checkpoint-interval calls and after the last test; flush() writes whatever
+    is still pending. Both are no-ops with --no-checkpoint, so loops call them
+    unconditionally.
+    """
+    if args.no_checkpoint:
+        def _noop(*_):
+            pass
+        return _noop, _noop
+
+    interval = getattr(args, 'checkpoint_interval', DEFAULT_CHECKPOINT_INTERVAL)
+    total = len(test_names)
+    state = {'pending': None, 'recorded': 0}
+
+    def flush():
+        index = state['pending']
+        if index is None:
+            return
+        next_test = test_names[index + 1] if index + 1 < total else None
+        write_checkpoint(
+            args.log_file, test_names[index], next_test, index, total, mode,
+            csv_file=args.csv_file, pytorch_path=args.pytorch_path,
+        )
+        state['pending'] = None
+
+    def record(index):
+        state['pending'] = index
+        state['recorded'] += 1
+        if state['recorded'] % interval == 0 or index + 1 == total:
+            flush()
+
+    return record, flush
 
 
 def read_tests_from_csv(csv_file):
@@ -1335,43 +1640,57 @@ def parse_log_for_rerun(log_path):
         tuple: (failed_test_names: list[str], timeout_test_names: list[str], mode: str or None).
         mode is 'full_suite' or 'csv', or None if not found. On read error, returns (None, None, None).
     """
+    # Stream the log line by line instead of loading it (and a list of its
+    # lines) into memory; CI logs with full pytest output can be very large.
     try:
-        content = Path(log_path).read_text(encoding='utf-8')
+        log = open(log_path, 'r', encoding='utf-8', errors='replace')
     except OSError:
         return None, None, None
-
+    # Runs from this version also write the summary lists as JSON lines; use
+    # them when present and fall back to scanning the text for older logs.
+    sidecar = _read_summary_sidecar(log_path)
+    if sidecar is not None and sidecar[2] is not None:
+        log.close()
+        return sidecar
+
+    # One pass: the first Mode line sets the mode, and only indented "- ..."
+    # lines inside a Failed/Timed out section need the test-line regex.
     mode = None
-    for line in content.splitlines():
-        m = MODE_LINE_RE.match(line.strip())
-        if m:
-            mode = m.group(1)
-            break
-
     failed_tests = []
     timeout_tests = []
     in_failed_section = False
     in_timeout_section = False
-    for line in content.splitlines():
-        stripped = line.strip()
-        if stripped == 'Failed tests:':
-            in_failed_section = True
-            in_timeout_section = False
-            continue
-        if stripped == 'Timed out tests:':
-            in_failed_section = False
-            in_timeout_section = True
-            continue
-        if stripped.startswith('====='):
-            in_failed_section = False
-            in_timeout_section = False
-            continue
-        match = FAILED_TEST_LINE_RE.match(line)
-        if match:
-            name = match.group(1).strip()
-            if in_failed_section:
-                failed_tests.append(name)
-            elif in_timeout_section:
-                timeout_tests.append(name)
+    with log:
+        for line in log:
+            stripped = line.strip()
+            if mode is None:
+                m = MODE_LINE_RE.match(stripped)
+                if m:
+                    mode = m.group(1)
+                    continue
+            if stripped == 'Failed tests:':
+                in_failed_section = True
+                in_timeout_section = False
+                continue
+            if stripped == 'Timed out tests:':
+                in_failed_section = False
+                in_timeout_section = True
+                continue
+            if stripped.startswith('====='):
+                in_failed_section = False
+                in_timeout_section = False
+                continue
+            if not (in_failed_section or in_timeout_section):
+                continue
+            if not line[:1].isspace() or not stripped.startswith('-'):
+                continue
+            match = FAILED_TEST_LINE_RE.match(line)
+            if match:
+                name = match.group(1).strip()
+                if in_failed_section:
+                    failed_tests.append(name)
+                else:
+                    timeout_tests.append(name)
     return failed_tests, timeout_tests, mode
 
 
@@ -1381,84 +1700,82 @@ def _resolve_start_index(test_names, log_file_path, resume, no_checkpoint, log_f
     Writes messages to console and log_file.
     """
     start_index = 0
+    cp = read_checkpoint(log_file_path) if resume or not no_checkpoint else None
     if resume:
-        cp = read_checkpoint(log_file_path)
         if not cp:
             msg = "No checkpoint found, starting from first test.\n\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
         elif cp.get('next_test') is None:
             msg = "Checkpoint shows previous run completed (no next test). Starting from first test.\n\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
         else:
             next_t = cp['next_test']
-            if next_t in test_names:
-                start_index = test_names.index(next_t)
+            # One scan: a lookup dict would cost the same to build for a single query.
+            try:
+                next_index = test_names.index(next_t)
+            except ValueError:
+                next_index = -1
+            if next_index >= 0:
+                start_index = next_index
                 msg = f"Resuming from test: {next_t} [{start_index + 1}/{len(test_names)}]\n\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             else:
                 msg = f"Checkpoint next_test {not_in_list_msg}, starting from first test.\n\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
-    elif not no_checkpoint and read_checkpoint(log_file_path):
-        cp = read_checkpoint(log_file_path)
+                _emit(log_file, msg, flush=True)
+    elif not no_checkpoint and cp:
         msg = f"Checkpoint from previous run: last test = {cp.get('last_test', '?')}, next test = {cp.get('next_test', '?')}. Use --resume to continue from next test.\n\n"
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
-        try:
-            Path(checkpoint_path(log_file_path)).unlink(missing_ok=True)
-        except OSError:
-            pass
+        _emit(log_file, msg, flush=True)
     if not no_checkpoint and start_index == 0:
-        try:
-            Path(checkpoint_path(log_file_path)).unlink(missing_ok=True)
-        except OSError:
-            pass
+        remove_checkpoint(log_file_path)
     return start_index
 
 
-def _write_run_summary(results, start_time, log_file, summary_title):
-    total_time = time.time() - start_time
-    passed = sum(1 for r in results if r.get('state') == STATE_PASSED)
-    skipped_count = sum(1 for r in results if r.get('state') == STATE_SKIPPED)
-    xfailed_count = sum(1 for r in results if r.get('state') == STATE_XFAILED)
-    error_count = sum(1 for r in results if r.get('state') == STATE_ERROR)
-    failed_count = sum(1 for r in results if r.get('state') == STATE_FAILED)
-    timedout_count = sum(1 for r in results if r.get('state') == STATE_TIMEDOUT)
-    missed_count = sum(1 for r in results if r.get('state') == STATE_MISSED)
-    flaky_count = sum(1 for r in results if r.get('flaky'))
-    consistent_failure_count = sum(1 for r in results if r.get('consistent_failure'))
-    summary = f"\n{'='*70}\n{summary_title}\n{'='*70}\n"
-    summary += f"Total tests run: {len(results)}\n"
-    summary += f"Passed: {passed}\n"
-    summary += f"Skipped: {skipped_count}\n"
-    summary += f"Xfailed: {xfailed_count}\n"
-    summary += f"Error: {error_count}\n"
-    summary += f"Failed: {failed_count}\n"
-    summary += f"Timed out: {timedout_count}\n"
-    summary += f"Missed: {missed_count}\n"
-    summary += f"Recovered flaky: {flaky_count}\n"
-    summary += f"Consistent failures: {consistent_failure_count}\n"
-    summary += f"Total time: {total_time:.2f}s\n"
+def _write_run_summary(results, start_time, log_file, summary_title, mode=None):
+    total_time = time.perf_counter() - start_time
+    # Bucket results by state once; a long failed list is then one join, not
+    # a quadratic chain of string concatenations.
+    by_state = {state: [] for state in (
+        STATE_PASSED, STATE_SKIPPED, STATE_XFAILED, STATE_ERROR,
+        STATE_FAILED, STATE_TIMEDOUT, STATE_MISSED,
+    )}
+    for r in results:
+        bucket = by_state.get(r.get('state'))
+        if bucket is not None:
+            bucket.append(r)
     flaky_tests = [r for r in results if r.get('flaky')]
-    if flaky_tests:
-        summary += "\nRecovered flaky tests:\n"
-        for r in flaky_tests:
-            summary += f"  - {r['name']} ({r['time']:.2f}s, attempts={r.get('attempts', 1)})\n"
     consistent_failures = [r for r in results if r.get('consistent_failure')]
+    error_count = len(by_state[STATE_ERROR])
+    failed_count = len(by_state[STATE_FAILED])
+    timedout_count = len(by_state[STATE_TIMEDOUT])
+    missed_count = len(by_state[STATE_MISSED])
+
+    parts = [
+        f"\n{'='*70}\n{summary_title}\n{'='*70}\n",
+        f"Total tests run: {len(results)}\n",
+        f"Passed: {len(by_state[STATE_PASSED])}\n",
+        f"Skipped: {len(by_state[STATE_SKIPPED])}\n",
+        f"Xfailed: {len(by_state[STATE_XFAILED])}\n",
+        f"Error: {error_count}\n",
+        f"Failed: {failed_count}\n",
+        f"Timed out: {timedout_count}\n",
+        f"Missed: {missed_count}\n",
+        f"Recovered flaky: {len(flaky_tests)}\n",
+        f"Consistent failures: {len(consistent_failures)}\n",
+        f"Total time: {total_time:.2f}s\n",
+    ]
+    if flaky_tests:
+        parts.append("\nRecovered flaky tests:\n")
+        parts.extend(
+            f"  - {r['name']} ({r['time']:.2f}s, attempts={r.get('attempts', 1)})\n"
+            for r in flaky_tests
+        )
     if consistent_failures:
-        summary += "\nConsistent failure tests:\n"
-        for r in consistent_failures:
-            signal_name = r.get('signal_name')
-            signal_part = f", signal={signal_name}" if signal_name else ""
-            summary += f"  - {r['name']} ({r['time']:.2f}s, attempts={r.get('attempts', 1)}{signal_part})\n"
+        parts.append("\nConsistent failure tests:\n")
+        parts.extend(
+            f"  - {r['name']} ({r['time']:.2f}s, attempts={r.get('attempts', 1)}"
+            f"{_signal_part(r)})\n"
+            for r in consistent_failures
+        )
     for state, label in [
         (STATE_PASSED, "Passed"),
         (STATE_SKIPPED, "Skipped"),
@@ -1468,26 +1785,31 @@ def _write_run_summary(results, start_time, log_file, summary_title):
         (STATE_TIMEDOUT, "Timed out"),
         (STATE_MISSED, "Missed"),
     ]:
-        subset = [r for r in results if r.get('state') == state]
+        subset = by_state[state]
         if subset:
-            summary += f"\n{label} tests:\n"
-            for r in subset:
-                signal_name = r.get('signal_name')
-                signal_part = f", signal={signal_name}" if signal_name else ""
-                summary += f"  - {r['name']} ({r['time']:.2f}s{signal_part})\n"
-    summary += f"{'='*70}\n\n"
-    print(summary, end='')
-    log_file.write(summary)
-    log_file.flush()
+            parts.append(f"\n{label} tests:\n")
+            parts.extend(
+                f"  - {r['name']} ({r['time']:.2f}s{_signal_part(r)})\n"
+                for r in subset
+            )
+    parts.append(f"{'='*70}\n\n")
+    summary = ''.join(parts)
+    _emit(log_file, summary, flush=True)
+    if mode is not None:
+        _append_summary_record(log_file, mode, summary_title, by_state)
     any_bad = error_count > 0 or failed_count > 0 or timedout_count > 0 or missed_count > 0
     return 0 if not any_bad else 1
 
 
-def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id, timeout):
+def _signal_part(result):
+    """Summary suffix naming the signal that killed a test, if any."""
+    signal_name = result.get('signal_name')
+    return f", signal={signal_name}" if signal_name else ""
+
+
+def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id, timeout, env=None):
     progress_msg = f"[{index}/{total}] "
-    print(progress_msg, end='')
-    log_file.write(progress_msg)
-    log_file.flush()
+    _emit(log_file, progress_msg)
 
     total_attempts = args.retry_attempts + 1
     attempts = []
@@ -1499,6 +1821,7 @@ def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id,
                 by_id=by_id,
                 attempt=attempt,
                 total_attempts=total_attempts,
+                env=env,
             )
         except subprocess.TimeoutExpired:
             attempt_result = {
@@ -1510,9 +1833,7 @@ def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id,
                 'signal_name': None,
             }
             timeout_msg = f"✗ TIMEOUT (uncaught in run_test) after {timeout:.2f}s\n"
-            print(timeout_msg, end='')
-            log_file.write(timeout_msg)
-            log_file.flush()
+            _emit(log_file, timeout_msg)
         except Exception as e:
             attempt_result = {
                 'success': False,
@@ -1523,9 +1844,7 @@ def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id,
                 'signal_name': None,
             }
             err_msg = f"✗ ERROR (uncaught): {type(e).__name__}: {e}\n"
-            print(err_msg, end='')
-            log_file.write(err_msg)
-            log_file.flush()
+            _emit(log_file, err_msg)
 
         attempts.append(attempt_result)
         if attempt_result['success']:
@@ -1535,9 +1854,7 @@ def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id,
                 f"Retrying {test_name} after {attempt_result['state']} "
                 f"(attempt {attempt + 1}/{total_attempts})\n"
             )
-            print(retry_msg, end='')
-            log_file.write(retry_msg)
-            log_file.flush()
+            _emit(log_file, retry_msg)
 
     final_result = attempts[-1]
     success = final_result['success']
@@ -1548,14 +1865,13 @@ def _run_one_test_with_progress(test_name, index, total, args, log_file, by_id,
     consistent_failure = not success and state in (STATE_FAILED, STATE_ERROR)
     if flaky:
         msg = f"Recovered flaky test after {len(attempts)} attempts: {test_name}\n"
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg)
     elif consistent_failure and len(attempts) > 1:
         msg = f"Consistent failure after {len(attempts)} attempts: {test_name}\n"
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg)
+    # run_test flushes before each spawn; flush once more per test so the
+    # log on disk is current between tests.
+    log_file.flush()
 
     return {
         'name': test_name, 'success': success, 'time': elapsed,
@@ -1575,33 +1891,33 @@ def _run_test_batch(test_names, start_index, args, log_file, mode, by_id, count_
     Returns exit code (0 if all passed, 1 otherwise).
     """
     msg = f"{count_msg}\n\n"
-    print(msg, end='')
-    log_file.write(msg)
-    log_file.flush()
+    _emit(log_file, msg, flush=True)
 
     results = []
-    start_time = time.time()
+    start_time = time.perf_counter()
     timeout = args.per_test_timeout or DEFAULT_PER_TEST_TIMEOUT_SECONDS
-    for i in range(start_index, len(test_names)):
-        test_name = test_names[i]
-        result = _run_one_test_with_progress(
-            test_name, i + 1, len(test_names), args, log_file, by_id, timeout
-        )
-        results.append(result)
-        if not args.no_checkpoint:
-            next_test = test_names[i + 1] if i + 1 < len(test_names) else None
-            write_checkpoint(
-                args.log_file, test_name, next_test, i, len(test_names), mode,
-                csv_file=args.csv_file, pytorch_path=args.pytorch_path
+    # The environment only depends on os.environ and the installed torch, so
+    # build it once for the whole batch instead of once per test attempt.
+    env = _build_test_env()
+    # Checkpoint every --checkpoint-interval tests; whatever is still pending
+    # is written when the batch ends, stops, or is interrupted.
+    record_checkpoint, flush_checkpoint = _make_checkpoint_recorder(args, test_names, mode)
+    try:
+        for i in range(start_index, len(test_names)):
+            test_name = test_names[i]
+            result = _run_one_test_with_progress(
+                test_name, i + 1, len(test_names), args, log_file, by_id, timeout, env=env
             )
-        if not result['success'] and args.stop_on_failure:
-            stop_msg = f"\nStopping due to test failure: {test_name}\n"
-            print(stop_msg, end='')
-            log_file.write(stop_msg)
-            log_file.flush()
-            break
+            results.append(result)
+            record_checkpoint(i)
+            if not result['success'] and args.stop_on_failure:
+                stop_msg = f"\nStopping due to test failure: {test_name}\n"
+                _emit(log_file, stop_msg, flush=True)
+                break
+    finally:
+        flush_checkpoint()
 
-    return _write_run_summary(results, start_time, log_file, summary_title)
+    return _write_run_summary(results, start_time, log_file, summary_title, mode=mode)
 
 
 def _normalize_process_attempt(node_id, item, reason, elapsed):
@@ -1657,9 +1973,7 @@ def _run_fresh_process_retries(
             f"Fresh-process retry {retry_number}/{retry_limit} for "
             f"{problem_node} (process timeout: {process_timeout}s)\n"
         )
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg, flush=True)
 
         retry_results, retry_reason, retry_elapsed, _ = _run_file_batch(
             file_name,
@@ -1772,9 +2086,7 @@ def _run_file_node_group(file_name, node_ids, args, log_file, mode, test_names,
                     f"Recovered after {recorded['attempts']} total attempts "
                     f"using fresh pytest processes: {problem_node}\n"
                 )
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             elif (
                 not recorded['success']
                 and recorded['attempts'] > 1
@@ -1783,9 +2095,7 @@ def _run_file_node_group(file_name, node_ids, args, log_file, mode, test_names,
                     f"Fresh-process retries exhausted after "
                     f"{recorded['attempts']} total attempts: {problem_node}\n"
                 )
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             results.append(recorded)
 
             remaining_nodes = remaining_nodes[problem_position + 1:]
@@ -1821,18 +2131,14 @@ def _run_file_node_group(file_name, node_ids, args, log_file, mode, test_names,
                 f"marking next unresolved test as missed ({unknown_timeout_misses}/"
                 f"{UNKNOWN_TIMEOUT_MISS_LIMIT}): {missed_node}\n"
             )
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
             remaining_nodes = remaining_nodes[1:]
             if unknown_timeout_misses >= UNKNOWN_TIMEOUT_MISS_LIMIT and remaining_nodes:
                 msg = (
                     f"Reached {UNKNOWN_TIMEOUT_MISS_LIMIT} consecutive unidentified timeouts "
                     f"in {file_name}; recording remaining tests as missed.\n"
                 )
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
                 for node_id in remaining_nodes:
                     node_index += 1
                     recorded = _record_file_batch_result(
@@ -1847,9 +2153,7 @@ def _run_file_node_group(file_name, node_ids, args, log_file, mode, test_names,
             f"Unable to continue {file_name} after file batch issue ({reason}). "
             "Recording remaining tests as missed.\n"
         )
-        print(msg, end='')
-        log_file.write(msg)
-        log_file.flush()
+        _emit(log_file, msg, flush=True)
         for node_id in remaining_nodes:
             if node_id in recorded_names:
                 continue
@@ -1887,12 +2191,10 @@ def _run_grouped_file_batch_mode(
     missed handling, and checkpointing stay consistent with file mode.
     """
     msg = f"{count_msg}\n\n"
-    print(msg, end='')
-    log_file.write(msg)
-    log_file.flush()
+    _emit(log_file, msg, flush=True)
 
     results = []
-    start_time = time.time()
+    start_time = time.perf_counter()
     groups = _group_node_ids_by_file(test_names[start_index:])
     node_index = start_index
     stop_requested = False
@@ -1904,18 +2206,14 @@ def _run_grouped_file_batch_mode(
                 f"Running {file_name} in {len(chunks)} shard(s) "
                 f"of up to {args.shard_size} test(s).\n"
             )
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
         for shard_index, chunk in enumerate(chunks, start=1):
             if should_shard:
                 msg = (
                     f"Shard {shard_index}/{len(chunks)} for {file_name}: "
                     f"{len(chunk)} test(s)\n"
                 )
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             node_index, stop_requested = _run_file_node_group(
                 file_name, chunk, args, log_file, mode, test_names, node_index, results
             )
@@ -1924,7 +2222,7 @@ def _run_grouped_file_batch_mode(
         if stop_requested:
             break
 
-    return _write_run_summary(results, start_time, log_file, summary_title)
+    return _write_run_summary(results, start_time, log_file, summary_title, mode=mode)
 
 
 def _run_file_batch_mode(test_names, start_index, args, log_file, mode, count_msg, summary_title):
@@ -2004,33 +2302,36 @@ def _assign_suite_groups_to_workers(groups, num_workers):
 def _run_worker_assigned_suites(assigned_groups, args, log_file, mode, worker_test_names):
     """Run one worker's assigned suites and write a single worker summary."""
     results = []
-    start_time = time.time()
+    start_time = time.perf_counter()
     node_index = 0
     stop_requested = False
+    # Built after the worker pinned its GPU in os.environ
+    test_env = _build_test_env() if args.batch_mode == BATCH_MODE_TEST else None
+
+    record_checkpoint, flush_checkpoint = _make_checkpoint_recorder(args, worker_test_names, mode)
 
     for file_name, node_ids in assigned_groups:
         if args.batch_mode == BATCH_MODE_TEST:
-            for node_id in node_ids:
-                result = _run_one_test_with_progress(
-                    node_id, node_index + 1, len(worker_test_names),
-                    args, log_file, by_id=True,
-                    timeout=args.per_test_timeout or DEFAULT_PER_TEST_TIMEOUT_SECONDS,
-                )
-                results.append(result)
-                node_index += 1
-                if not args.no_checkpoint:
-                    next_test = worker_test_names[node_index] if node_index < len(worker_test_names) else None
-                    write_checkpoint(
-                        args.log_file, node_id, next_test, node_index - 1, len(worker_test_names), mode,
-                        csv_file=args.csv_file, pytorch_path=args.pytorch_path,
+            try:
+                for node_id in node_ids:
+                    result = _run_one_test_with_progress(
+                        node_id, node_index + 1, len(worker_test_names),
+                        args, log_file, by_id=True,
+                        timeout=args.per_test_timeout or DEFAULT_PER_TEST_TIMEOUT_SECONDS,
+                        env=test_env,
                     )
-                if not result['success'] and args.stop_on_failure:
-                    stop_msg = f"\nStopping due to test failure: {node_id}\n"
-                    print(stop_msg, end='')
-                    log_file.write(stop_msg)
-                    log_file.flush()
-                    stop_requested = True
-                    break
+                    results.append(result)
+                    record_checkpoint(node_index)
+                    node_index += 1
+                    if not result['success'] and args.stop_on_failure:
+                        stop_msg = f"\nStopping due to test failure: {node_id}\n"
+                        _emit(log_file, stop_msg, flush=True)
+                        stop_requested = True
+                        break
+            finally:
+                # Flush the interval checkpoint at each suite boundary, and
+                # when SIGTERM or Ctrl-C interrupts the worker mid-suite
+                flush_checkpoint()
         else:
             should_shard = (
                 args.batch_mode == BATCH_MODE_SHARD
@@ -2042,18 +2343,14 @@ def _run_worker_assigned_suites(assigned_groups, args, log_file, mode, worker_te
                     f"Running {file_name} in {len(chunks)} shard(s) "
                     f"of up to {args.shard_size} test(s).\n"
                 )
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             for shard_index, chunk in enumerate(chunks, start=1):
                 if should_shard:
                     msg = (
                         f"Shard {shard_index}/{len(chunks)} for {file_name}: "
                         f"{len(chunk)} test(s)\n"
                     )
-                    print(msg, end='')
-                    log_file.write(msg)
-                    log_file.flush()
+                    _emit(log_file, msg, flush=True)
                 node_index, stop_requested = _run_file_node_group(
                     file_name, chunk, args, log_file, mode, worker_test_names, node_index, results
                 )
@@ -2065,11 +2362,12 @@ def _run_worker_assigned_suites(assigned_groups, args, log_file, mode, worker_te
     exit_code = _write_run_summary(
         results, start_time, log_file,
         f"TEST SUMMARY (worker {getattr(args, 'worker_id', '?')})",
+        mode=mode,
     )
     return exit_code, _result_state_counts(results)
 
 
-def _concurrent_worker_main(worker_spec, args_dict, result_queue):
+def _concurrent_worker_main(worker_spec, args_dict, mode, result_queue):
     """Worker process entry point for suite-level GPU concurrency."""
     worker_id = worker_spec['worker_id']
     gpu_id = str(worker_spec['gpu_id'])
@@ -2084,8 +2382,11 @@ def _concurrent_worker_main(worker_spec, args_dict, result_queue):
         for node_id in node_ids
     ]
 
-    subprocess.os.environ['HIP_VISIBLE_DEVICES'] = gpu_id
-    subprocess.os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
+    os.environ['HIP_VISIBLE_DEVICES'] = gpu_id
+    os.environ['CUDA_VISIBLE_DEVICES'] = gpu_id
+    # Set explicitly: spawn/forkserver workers do not inherit the parent's
+    # handler, and the parent stops workers with terminate() (SIGTERM).
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
 
     args = SimpleNamespace(**args_dict)
     args.log_file = worker_log_path
@@ -2101,10 +2402,11 @@ def _concurrent_worker_main(worker_spec, args_dict, result_queue):
     error = None
 
     try:
-        with open(worker_log_path, 'w', encoding='utf-8') as log_file:
+        _remove_file_quietly(summary_sidecar_path(worker_log_path))
+        with open(worker_log_path, 'w', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as log_file:
             log_file.write(f"Worker: {worker_id}\n")
             log_file.write(f"GPU: {gpu_id}\n")
-            log_file.write(f"Mode: full_suite\n")
+            log_file.write(f"Mode: {mode}\n")
             log_file.write(f"Batch mode: {args.batch_mode}\n")
             log_file.write(f"Retry attempts: {args.retry_attempts}\n")
             log_file.write(f"Worker start: {start_time}\n")
@@ -2112,7 +2414,7 @@ def _concurrent_worker_main(worker_spec, args_dict, result_queue):
             log_file.write(f"Assigned tests: {len(worker_test_names)}\n\n")
             log_file.flush()
             exit_code, counts = _run_worker_assigned_suites(
-                assigned_groups, args, log_file, 'full_suite', worker_test_names
+                assigned_groups, args, log_file, mode, worker_test_names
             )
             end_epoch = time.time()
             log_file.write(f"Worker end: {_now_iso()}\n")
@@ -2150,8 +2452,13 @@ def _concurrent_worker_main(worker_spec, args_dict, result_queue):
 
 
 def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_prefix):
-    """Run full-suite file groups concurrently across GPUs."""
-    groups = _group_node_ids_by_file(test_names)
+    """Run full-suite or CSV file groups concurrently across GPUs."""
+    # CSV rows for one file need not be adjacent; merge them so a file is
+    # never split across workers. Discovered node ids are already grouped.
+    merged = {}
+    for file_name, node_ids in _group_node_ids_by_file(test_names):
+        merged.setdefault(file_name, []).extend(node_ids)
+    groups = list(merged.items())
     serial_groups, parallel_groups = _split_serial_and_parallel_groups(
         groups, args.pytorch_path
     )
@@ -2225,9 +2532,8 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
         f"Retry attempts: {args.retry_attempts}. "
         f"Manifest: {manifest_path}\n\n"
     )
-    print(msg, end='')
-    log_file.write(msg)
-    log_file.write("Mode: full_suite\n")
+    _emit(log_file, msg)
+    log_file.write(f"Mode: {mode}\n")
     log_file.write(f"Batch mode: {args.batch_mode}\n")
     log_file.write(f"Retry attempts: {args.retry_attempts}\n")
     log_file.write(f"Serial suites: {len(serial_groups)}\n")
@@ -2250,10 +2556,11 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
         serial_exit_code = 1
         serial_counts = _result_state_counts([])
         try:
-            with open(serial_spec['log'], 'w', encoding='utf-8') as serial_log:
+            _remove_file_quietly(summary_sidecar_path(serial_spec['log']))
+            with open(serial_spec['log'], 'w', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as serial_log:
                 serial_log.write("Worker: serial\n")
                 serial_log.write("GPU: inherited\n")
-                serial_log.write("Mode: full_suite\n")
+                serial_log.write(f"Mode: {mode}\n")
                 serial_log.write(f"Batch mode: {args.batch_mode}\n")
                 serial_log.write(f"Retry attempts: {args.retry_attempts}\n")
                 serial_log.write(f"Worker start: {serial_start_time}\n")
@@ -2264,7 +2571,7 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
                     serial_groups,
                     serial_args,
                     serial_log,
-                    'full_suite',
+                    mode,
                     serial_test_names,
                 )
                 serial_end_epoch = time.time()
@@ -2308,14 +2615,25 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
     for worker_spec in worker_specs:
         process = multiprocessing.Process(
             target=_concurrent_worker_main,
-            args=(worker_spec, args_dict, result_queue),
+            args=(worker_spec, args_dict, mode, result_queue),
         )
         process.start()
         processes.append(process)
 
     worker_results = []
-    for _ in processes:
-        worker_results.append(result_queue.get())
+    try:
+        for _ in processes:
+            worker_results.append(result_queue.get())
+    except BaseException:
+        # SIGTERM/Ctrl-C in the parent: stop the workers so their logs and
+        # pending checkpoints are flushed, instead of leaving multiprocessing's
+        # exit handler to wait for them to finish the whole suite.
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        raise
     for process in processes:
         process.join()
 
@@ -2349,7 +2667,8 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
     manifest['exit_code'] = 1 if _counts_have_bad_results(aggregate_counts) else 0
     _write_manifest(manifest_path, manifest)
 
-    summary = f"\n{'='*70}\nTEST SUMMARY (full suite concurrent)\n{'='*70}\n"
+    summary_label = "full suite" if mode == 'full_suite' else mode
+    summary = f"\n{'='*70}\nTEST SUMMARY ({summary_label} concurrent)\n{'='*70}\n"
     summary += f"Total tests run: {aggregate_counts['total']}\n"
     summary += f"Passed: {aggregate_counts[STATE_PASSED]}\n"
     summary += f"Skipped: {aggregate_counts[STATE_SKIPPED]}\n"
@@ -2361,20 +2680,23 @@ def _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_pre
     summary += f"Total time: {end_epoch - start_epoch:.2f}s\n"
     summary += f"Concurrent manifest: {manifest_path}\n"
     summary += f"{'='*70}\n\n"
-    print(summary, end='')
-    log_file.write(summary)
-    log_file.flush()
+    _emit(log_file, summary, flush=True)
     return manifest['exit_code']
 
 
-def _run_full_suite_batch(test_names, start_index, args, log_file, mode, count_prefix):
-    """Dispatch full-suite execution to the selected batch mode."""
+def _run_full_suite_batch(
+    test_names, start_index, args, log_file, mode, count_prefix,
+    summary_title="TEST SUMMARY (full suite)",
+):
+    """
+    Dispatch node-id execution to the selected batch mode.
+
+    Used by full-suite mode and by CSV mode with --batch-mode file/shard.
+    """
     if args.num_gpus > 1:
         if start_index != 0:
-            msg = "--num-gpus does not support resume/start offsets yet. Start a fresh full-suite run.\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            msg = "--num-gpus does not support resume/start offsets yet. Start a fresh run.\n"
+            _emit(log_file, msg, flush=True)
             return 1
         return _run_concurrent_full_suite_batch(test_names, args, log_file, mode, count_prefix)
 
@@ -2386,7 +2708,7 @@ def _run_full_suite_batch(test_names, start_index, args, log_file, mode, count_p
         )
         return _run_file_batch_mode(
             test_names, start_index, args, log_file, mode,
-            count_msg=count_msg, summary_title="TEST SUMMARY (full suite)"
+            count_msg=count_msg, summary_title=summary_title
         )
     if args.batch_mode == BATCH_MODE_SHARD:
         count_msg = (
@@ -2396,16 +2718,21 @@ def _run_full_suite_batch(test_names, start_index, args, log_file, mode, count_p
         )
         return _run_shard_batch_mode(
             test_names, start_index, args, log_file, mode,
-            count_msg=count_msg, summary_title="TEST SUMMARY (full suite)"
+            count_msg=count_msg, summary_title=summary_title
         )
 
     count_msg = f"{count_prefix} Per-test timeout: {args.per_test_timeout}s. Retry attempts: {args.retry_attempts}"
     return _run_test_batch(
         test_names, start_index, args, log_file, mode, by_id=True,
-        count_msg=count_msg, summary_title="TEST SUMMARY (full suite)"
+        count_msg=count_msg, summary_title=summary_title
     )
 
 
+def _exit_on_sigterm(signum, frame):
+    """SIGTERM handler: exit through SystemExit so cleanup code runs."""
+    raise SystemExit(128 + signum)
+
+
 def main():
     """Main function to run all tests."""
     import argparse
@@ -2495,8 +2822,11 @@ def main():
     parser.add_argument(
         '--batch-mode',
         choices=[BATCH_MODE_FILE, BATCH_MODE_SHARD, BATCH_MODE_TEST],
-        default=BATCH_MODE_FILE,
-        help='Full-suite execution granularity: file batches by default, fixed-size shards, or one subprocess per pytest node with test'
+        default=None,
+        help=(
+            'Execution granularity: file batches, fixed-size shards, or one subprocess per pytest node with test '
+            '(default: file for --all-tests, test for CSV and rerun-failed modes)'
+        )
     )
     parser.add_argument(
         '--per-file-timeout',
@@ -2517,17 +2847,29 @@ def main():
         type=int,
         default=1,
         metavar='N',
-        help='Full-suite only: run up to N test suites concurrently, one worker per GPU (default: 1)'
+        help='Full-suite and CSV modes: run up to N test suites concurrently, one worker per GPU (default: 1)'
     )
     parser.add_argument(
         '--resume',
         action='store_true',
         help='Resume from the next test after the last run (uses checkpoint for this log file)'
     )
+    parser.add_argument(
+        '--no-discover-cache',
+        action='store_true',
+        help='Full-suite only: re-run pytest collection without reading or updating the discovery cache (default: reuse for 24h)'
+    )
     parser.add_argument(
         '--no-checkpoint',
         action='store_true',
-        help='Disable checkpointing (default: checkpoint after each test for resume)'
+        help='Disable checkpointing (default: checkpoint periodically for resume)'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        metavar='N',
+        help='In one-test-per-process execution, write the checkpoint every N tests and when the run ends (default: 10); file/shard batches checkpoint after each batch'
     )
     parser.add_argument(
         '--regex',
@@ -2629,6 +2971,10 @@ def main():
         sys.exit(1)
     if args.regex and not args.all_tests:
         print("Warning: --regex only applies to full-suite mode (--all-tests); ignoring --regex.\n")
+    if args.batch_mode is None:
+        # File batches amortize interpreter and torch import cost in full-suite
+        # mode; CSV and rerun modes keep one process per node unless asked to batch.
+        args.batch_mode = BATCH_MODE_FILE if args.all_tests else BATCH_MODE_TEST
     if args.per_test_timeout is None:
         args.per_test_timeout = DEFAULT_PER_TEST_TIMEOUT_SECONDS
     if args.retry_attempts < 0:
@@ -2637,14 +2983,17 @@ def main():
     if args.shard_size <= 0:
         print("Error: --shard-size must be a positive integer")
         sys.exit(1)
+    if args.checkpoint_interval <= 0:
+        print("Error: --checkpoint-interval must be a positive integer")
+        sys.exit(1)
     if args.num_gpus <= 0:
         print("Error: --num-gpus must be a positive integer")
         sys.exit(1)
-    if args.num_gpus > 1 and not args.all_tests:
-        print("Error: --num-gpus > 1 is only supported with full-suite mode (--all-tests)")
+    if args.num_gpus > 1 and args.rerun_failed:
+        print("Error: --num-gpus > 1 is not supported with --rerun-failed")
         sys.exit(1)
     if args.num_gpus > 1 and args.resume:
-        print("Error: --resume is not supported with --num-gpus > 1 yet. Start a fresh full-suite run.")
+        print("Error: --resume is not supported with --num-gpus > 1 yet. Start a fresh run.")
         sys.exit(1)
 
     # Resolve ROCM_HOME early so configuration errors are reported before discovery.
@@ -2666,15 +3015,20 @@ def main():
     # In collect-only mode we don't create a log file (use in-memory buffer for any internal writes).
     # Resume appends so previously completed results remain available for final analysis.
     log_mode = 'a' if args.resume else 'w'
-    log_file = io.StringIO() if args.collect_only else open(args.log_file, log_mode, encoding='utf-8')
-
-    try:
+    if log_mode == 'w' and not args.collect_only:
+        _remove_file_quietly(summary_sidecar_path(args.log_file))
+    # Turn SIGTERM (e.g. a CI job timeout) into SystemExit so the log's with
+    # block and finally blocks still flush the buffered log and any pending checkpoint.
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+    with (
+        io.StringIO() if args.collect_only
+        else open(args.log_file, log_mode, encoding='utf-8', buffering=LOG_BUFFER_SIZE)
+    ) as log_file:
         if not args.collect_only:
             msg = f"PyTorch path: {args.pytorch_path}\n"
             msg += f"Logging to: {args.log_file}\n\n"
-            print(msg, end='')
-            log_file.write(msg)
-            log_file.flush()
+            _emit(log_file, msg, flush=True)
 
         exit_code = 1  # default if we never run the batch
 
@@ -2695,9 +3049,7 @@ def main():
                 if timeout_tests and not args.rerun_include_timeouts:
                     msg += " (Use --rerun-include-timeouts to also re-run timed out tests.)"
                 msg += "\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
                 exit_code = 0
             else:
                 ensure_pytest_and_timeout_installed()
@@ -2706,36 +3058,48 @@ def main():
                 msg = f"Re-running failed tests from: {args.rerun_failed}\n"
                 if args.rerun_include_timeouts and timeout_tests:
                     msg += f"Including {len(timeout_tests)} timed out test(s).\n"
-                print(msg, end='')
-                log_file.write(msg)
+                _emit(log_file, msg)
                 log_file.write(f"Mode: {mode}\n")
                 log_file.flush()
-                count_msg = (
-                    f"Re-running {len(tests_to_rerun)} test(s). "
-                    f"Per-test timeout: {args.per_test_timeout}s. "
-                    f"Retry attempts: {args.retry_attempts}"
-                )
-                exit_code = _run_test_batch(
-                    tests_to_rerun, 0, args, log_file, mode, by_id=True,
-                    count_msg=count_msg, summary_title="TEST SUMMARY (rerun failed)"
-                )
+                if args.batch_mode == BATCH_MODE_TEST:
+                    count_msg = (
+                        f"Re-running {len(tests_to_rerun)} test(s). "
+                        f"Per-test timeout: {args.per_test_timeout}s. "
+                        f"Retry attempts: {args.retry_attempts}"
+                    )
+                    exit_code = _run_test_batch(
+                        tests_to_rerun, 0, args, log_file, mode, by_id=True,
+                        count_msg=count_msg, summary_title="TEST SUMMARY (rerun failed)"
+                    )
+                else:
+                    # Failed and timed-out lists are separate log sections, so
+                    # regroup by file to collect each file once per batch.
+                    by_file = {}
+                    for node_id in tests_to_rerun:
+                        by_file.setdefault(_node_file(node_id), []).append(node_id)
+                    tests_to_rerun = [n for node_ids in by_file.values() for n in node_ids]
+                    exit_code = _run_full_suite_batch(
+                        tests_to_rerun, 0, args, log_file, mode,
+                        count_prefix=f"Re-running {len(tests_to_rerun)} test(s).",
+                        summary_title="TEST SUMMARY (rerun failed)",
+                    )
         elif args.all_tests:
             ensure_pytest_and_timeout_installed()
             # Full-suite mode: discover tests, then run each with per-test timeout (pytest-timeout)
             msg = "Discovering tests (pytest --collect-only)...\n"
-            print(msg, end='')
-            log_file.write(msg)
+            _emit(log_file, msg)
             log_file.write("Mode: full_suite\n")
             log_file.flush()
             test_file_rel_paths = None
             if args.input_files:
                 test_file_rel_paths = [str(Path('test') / f) for f in args.input_files]
-            test_names = discover_tests(args.pytorch_path, log_file, test_file_rel_paths=test_file_rel_paths)
+            test_names = discover_tests(
+                args.pytorch_path, log_file, test_file_rel_paths=test_file_rel_paths,
+                use_cache=not args.no_discover_cache,
+            )
             if not test_names:
                 msg = "No tests discovered. Check that pytest can collect from the test file.\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.flush()
+                _emit(log_file, msg, flush=True)
             else:
                 # Apply --regex filter if given (only in full-suite mode)
                 if args.regex:
@@ -2743,21 +3107,15 @@ def main():
                         pattern = re.compile(args.regex)
                     except re.error as e:
                         msg = f"Error: invalid regex pattern {args.regex!r}: {e}\n"
-                        print(msg, end='')
-                        log_file.write(msg)
-                        log_file.flush()
+                        _emit(log_file, msg, flush=True)
                         sys.exit(1)
                     original_count = len(test_names)
                     test_names = [n for n in test_names if pattern.search(n)]
                     msg = f"Filter --regex {args.regex!r}: {len(test_names)} test(s) match (from {original_count} discovered).\n"
-                    print(msg, end='')
-                    log_file.write(msg)
-                    log_file.flush()
+                    _emit(log_file, msg, flush=True)
                     if not test_names:
                         msg = "No tests match the regex. Nothing to run.\n"
-                        print(msg, end='')
-                        log_file.write(msg)
-                        log_file.flush()
+                        _emit(log_file, msg, flush=True)
                         exit_code = 0
                     else:
                         if args.collect_only:
@@ -2787,16 +3145,13 @@ def main():
             # CSV mode: read pytest node IDs and run each one exactly.
             ensure_pytest_and_timeout_installed()
             msg = f"Reading tests from: {args.csv_file}\n"
-            print(msg, end='')
-            log_file.write(msg)
+            _emit(log_file, msg)
             log_file.write("Mode: csv\n")
             log_file.flush()
             test_names = read_tests_from_csv(args.csv_file)
             if not test_names:
                 msg = "No tests found in CSV file.\n"
-                print(msg, end='')
-                log_file.write(msg)
-                log_file.close()
+                _emit(log_file, msg)
                 sys.exit(1)
             if args.collect_only:
                 _do_collect_only_and_exit(args.pytorch_path, test_names, by_id=True)
@@ -2805,15 +3160,22 @@ def main():
                 test_names, args.log_file, args.resume, args.no_checkpoint, log_file,
                 "not in CSV list"
             )
-            count_msg = f"Found {len(test_names)} test(s) to run"
-            exit_code = _run_test_batch(
-                test_names, start_index, args, log_file, mode, by_id=True,
-                count_msg=count_msg, summary_title="TEST SUMMARY"
-            )
+            if args.batch_mode == BATCH_MODE_TEST and args.num_gpus == 1:
+                count_msg = f"Found {len(test_names)} test(s) to run"
+                exit_code = _run_test_batch(
+                    test_names, start_index, args, log_file, mode, by_id=True,
+                    count_msg=count_msg, summary_title="TEST SUMMARY"
+                )
+            else:
+                # Consecutive CSV rows from the same file share one pytest
+                # process, with the same recovery as full-suite file batches.
+                # --num-gpus > 1 also goes through here for the suite workers.
+                exit_code = _run_full_suite_batch(
+                    test_names, start_index, args, log_file, mode,
+                    count_prefix=f"Found {len(test_names)} test(s) to run.",
+                    summary_title="TEST SUMMARY",
+                )
 
-    finally:
-        log_file.close()
-    
     sys.exit(exit_code)
 
 
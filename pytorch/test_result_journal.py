@@ -233,6 +233,60 @@ def test_passes_on_rerun():
     assert results[-1]["state"] == "passed"
 
 
+def test_result_journal_records_unittest_expected_failure_as_xfailed(tmp_path):
+    test_file = tmp_path / "test_expected.py"
+    test_file.write_text(
+        """
+import unittest
+
+
+class TestExpected(unittest.TestCase):
+    @unittest.expectedFailure
+    def test_expected_failure(self):
+        raise AssertionError("known bug")
+
+    def test_skipped(self):
+        self.skipTest("not supported")
+""".lstrip(),
+        encoding="utf-8",
+    )
+    journal = tmp_path / "results.jsonl"
+    env = os.environ.copy()
+    env[result_journal.JOURNAL_ENV] = str(journal)
+    env["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+    env.pop("PYTEST_ADDOPTS", None)
+    existing_pythonpath = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = str(PYTORCH_SCRIPTS_DIR) + (
+        os.pathsep + existing_pythonpath if existing_pythonpath else ""
+    )
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "pytest_result_journal",
+            "-q",
+            str(test_file),
+        ],
+        cwd=tmp_path,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        timeout=30,
+    )
+
+    assert completed.returncode == 0, completed.stdout
+    results, _ = run_tests._parse_result_journal(journal)
+    states = {result["name"].rsplit("::", 1)[-1]: result["state"] for result in results}
+    assert states == {
+        "test_expected_failure": "xfailed",
+        "test_skipped": "skipped",
+    }
+
+
 @pytest.mark.skipif(os.name != "posix", reason="SIGSEGV integration is POSIX-only")
 def test_file_batch_recovers_completed_nodes_from_sigsegv_journal(
     tmp_path, monkeypatch
@@ -610,3 +664,282 @@ def test_test_env_prevents_source_checkout_from_shadowing_installed_torch(
 
     assert normal_script.returncode == 0, normal_script.stderr
     assert normal_script.stdout.strip() == "sibling import works"
+
+
+def test_parse_log_for_rerun_reads_mode_and_summary_sections(tmp_path):
+    log = tmp_path / "run.log"
+    log.write_text(
+        """
+PyTorch path: /src/pytorch
+Mode: full_suite
+  - test/inductor/test_a.py::TestA::test_progress_line (1.00s)
+
+======================================================================
+TEST SUMMARY (full suite)
+======================================================================
+Consistent failure tests:
+  - test/inductor/test_a.py::TestA::test_fail (0.50s, attempts=3)
+
+Passed tests:
+  - test/inductor/test_a.py::TestA::test_pass (0.10s)
+
+Failed tests:
+  - test/inductor/test_a.py::TestA::test_fail (0.50s)
+  - test/inductor/test_a.py::TestA::test_crash (0.20s, signal=SIGSEGV)
+
+Timed out tests:
+  - test/inductor/test_b.py::TestB::test_hang[param] (300.00s)
+======================================================================
+Failed tests:
+  - test/inductor/test_c.py::TestC::test_stale_summary (0.01s)
+""".lstrip(),
+        encoding="utf-8",
+    )
+
+    failed, timed_out, mode = run_tests.parse_log_for_rerun(log)
+
+    assert mode == "full_suite"
+    assert failed == [
+        "test/inductor/test_a.py::TestA::test_fail",
+        "test/inductor/test_c.py::TestC::test_stale_summary",
+    ]
+    assert timed_out == ["test/inductor/test_b.py::TestB::test_hang[param]"]
+    assert run_tests.parse_log_for_rerun(tmp_path / "missing.log") == (
+        None,
+        None,
+        None,
+    )
+
+
+def test_parse_log_for_rerun_prefers_summary_sidecar(tmp_path):
+    def result(name, state, signal_name=None):
+        return {
+            "name": name,
+            "state": state,
+            "time": 1.0,
+            "success": False,
+            "signal_name": signal_name,
+        }
+
+    results = [
+        result("test/inductor/test_a.py::TestA::test_fail", "failed"),
+        result("test/inductor/test_a.py::TestA::test_crash", "failed", "SIGSEGV"),
+        result("test/inductor/test_b.py::TestB::test_hang", "timedout"),
+        result("test/inductor/test_b.py::TestB::test_missed", "missed"),
+    ]
+    log_path = tmp_path / "run.log"
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        log_file.write("Mode: csv\n")
+        run_tests._write_run_summary(
+            results, 0.0, log_file, "TEST SUMMARY", mode="csv"
+        )
+
+    failed, timed_out, mode = run_tests.parse_log_for_rerun(log_path)
+
+    assert mode == "csv"
+    assert failed == [
+        "test/inductor/test_a.py::TestA::test_fail",
+        "test/inductor/test_a.py::TestA::test_crash",
+    ]
+    # Missed nodes follow the Timed out section, as in the text scan.
+    assert timed_out == [
+        "test/inductor/test_b.py::TestB::test_hang",
+        "test/inductor/test_b.py::TestB::test_missed",
+    ]
+
+    Path(run_tests.summary_sidecar_path(log_path)).unlink()
+    text_failed, text_timed_out, text_mode = run_tests.parse_log_for_rerun(log_path)
+    assert text_mode == mode
+    assert text_timed_out == timed_out
+    # The text scan cannot read entries with a signal suffix.
+    assert text_failed == ["test/inductor/test_a.py::TestA::test_fail"]
+
+
+def test_checkpoint_recorder_writes_at_interval_and_on_flush(tmp_path):
+    test_names = [f"test/inductor/test_a.py::TestA::test_{i}" for i in range(5)]
+    log_path = str(tmp_path / "run.log")
+    args = SimpleNamespace(
+        no_checkpoint=False,
+        checkpoint_interval=2,
+        log_file=log_path,
+        csv_file="tests.csv",
+        pytorch_path="/pytorch",
+    )
+    record, flush = run_tests._make_checkpoint_recorder(args, test_names, "csv")
+
+    record(0)
+    assert run_tests.read_checkpoint(log_path) is None
+    record(1)
+    assert run_tests.read_checkpoint(log_path)["next_test"] == test_names[2]
+    record(2)
+    flush()
+    checkpoint = run_tests.read_checkpoint(log_path)
+    assert checkpoint["last_index"] == 2
+    assert checkpoint["next_test"] == test_names[3]
+
+    args.no_checkpoint = True
+    run_tests.remove_checkpoint(log_path)
+    record, flush = run_tests._make_checkpoint_recorder(args, test_names, "csv")
+    record(4)
+    flush()
+    assert run_tests.read_checkpoint(log_path) is None
+
+
+def test_discovery_cache_key_tracks_checkout_helper_modules(tmp_path):
+    checkout = tmp_path / "pytorch"
+    helper = checkout / "torch" / "testing" / "_internal" / "common_utils.py"
+    helper.parent.mkdir(parents=True)
+    helper.write_text("DEVICES = ['cuda']\n", encoding="utf-8")
+    test_file = checkout / "test" / "inductor" / "test_a.py"
+    test_file.parent.mkdir(parents=True)
+    test_file.write_text("def test_a():\n    pass\n", encoding="utf-8")
+
+    def key():
+        return run_tests._discovery_cache_path(checkout, [str(test_file)], {})
+
+    assert key() is None, "no git state: the discovery must not be cached"
+
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run([*git, "init", "-q"], cwd=checkout, check=True)
+    subprocess.run([*git, "add", "."], cwd=checkout, check=True)
+    subprocess.run([*git, "commit", "-qm", "base"], cwd=checkout, check=True)
+    committed = key()
+    assert committed is not None
+    assert key() == committed
+
+    helper.write_text("DEVICES = ['cuda', 'cpu']\n", encoding="utf-8")
+    first_edit = key()
+    assert first_edit != committed
+    helper.write_text("DEVICES = ['cpu']\n", encoding="utf-8")
+    assert key() not in (committed, first_edit)
+
+    helper.write_text("DEVICES = ['cuda']\n", encoding="utf-8")
+    (checkout / "test" / "inductor" / "new_utils.py").write_text("X = 1\n", encoding="utf-8")
+    assert key() != committed
+
+
+def test_sigterm_stops_concurrent_workers_and_flushes_checkpoints(tmp_path):
+    import signal
+    import time
+
+    inductor_dir = tmp_path / "test" / "inductor"
+    inductor_dir.mkdir(parents=True)
+    node_ids = []
+    for name in ("a", "b"):
+        (inductor_dir / f"test_{name}.py").write_text(
+            """
+import time
+
+
+def test_0_fast():
+    pass
+
+
+def test_1_slow():
+    time.sleep(120)
+
+
+def test_2_slow():
+    time.sleep(120)
+""".lstrip(),
+            encoding="utf-8",
+        )
+        node_ids += [
+            f"test/inductor/test_{name}.py::{test}"
+            for test in ("test_0_fast", "test_1_slow", "test_2_slow")
+        ]
+    csv_path = tmp_path / "tests.csv"
+    csv_path.write_text("test_name\n" + "\n".join(node_ids) + "\n", encoding="utf-8")
+    log_path = tmp_path / "run.log"
+    worker_logs = [Path(f"{log_path}.worker{i}") for i in range(2)]
+
+    env = {**os.environ, "ROCM_HOME": os.environ.get("ROCM_HOME") or "/opt/rocm"}
+    proc = subprocess.Popen(
+        [
+            sys.executable, str(PYTORCH_SCRIPTS_DIR / "run_tests.py"), str(csv_path),
+            "--pytorch-path", str(tmp_path), "--log-file", str(log_path),
+            "--num-gpus", "2", "--retry-attempts", "0", "--checkpoint-interval", "100",
+        ],
+        cwd=tmp_path,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Own process group, so cleanup can reach workers and pytest children.
+        start_new_session=True,
+    )
+    try:
+        deadline = time.monotonic() + 120
+        while not all(
+            p.exists() and "PASSED" in p.read_text(encoding="utf-8") for p in worker_logs
+        ):
+            assert proc.poll() is None, "run ended before the slow tests started"
+            assert time.monotonic() < deadline, "workers did not finish their first test"
+            time.sleep(0.2)
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=60) == 128 + signal.SIGTERM
+    finally:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+
+    for worker_log in worker_logs:
+        checkpoint = run_tests.read_checkpoint(worker_log)
+        # The interval was never reached; the pending entry was flushed on SIGTERM.
+        assert checkpoint is not None
+        assert checkpoint["last_test"].endswith("::test_0_fast")
+        assert checkpoint["next_test"].endswith("::test_1_slow")
+
+
+def test_collect_only_parser_ends_node_ids_at_every_line_boundary():
+    output = (
+        "test/inductor/test_a.py::TestA::test_one\x0cstray text\n"
+        "  test/inductor/test_a.py::TestA::test_two[param]\u2028trailer\r"
+        "test/inductor/test_b.py::TestB::test_three \x85\n"
+        "collected 3 items\n"
+    )
+
+    assert run_tests._parse_pytest_collect_only_quiet(output) == [
+        "test/inductor/test_a.py::TestA::test_one",
+        "test/inductor/test_a.py::TestA::test_two[param]",
+        "test/inductor/test_b.py::TestB::test_three",
+    ]
+
+
+def test_output_markers_are_found_beyond_the_log_tail(tmp_path):
+    log_path = tmp_path / "run.log"
+    with open(log_path, "w+", encoding="utf-8") as log_file:
+        log_file.write("earlier test: RuntimeError\n")
+        start = log_file.tell()
+        head = "E   RuntimeError: boom\n" + "x" * 1_500_000 + "\n"
+        log_file.write(head + "Timeout\n1 failed in 1.00s\n")
+
+        # The chunk boundary splits "Timeout" after "Ti".
+        markers = run_tests._scan_output_markers(log_file, start, chunk_size=len(head) + 2)
+        tail = run_tests._read_log_tail_from(log_file, start)
+
+    assert "RuntimeError" not in tail
+    assert markers == {"RuntimeError", "Timeout"}
+    assert (
+        run_tests._classify_single_run(1, tail, [], markers=markers - {"Timeout"})
+        == run_tests.STATE_ERROR
+    )
+    assert run_tests._classify_single_run(1, tail, [], markers=markers) == run_tests.STATE_TIMEDOUT
+
+
+def test_discover_tests_without_cache_skips_cache_key(tmp_path, monkeypatch):
+    test_file = tmp_path / "test_a.py"
+    test_file.write_text("def test_a():\n    pass\n", encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache key computed under --no-discover-cache")
+
+    monkeypatch.setattr(run_tests, "_discovery_cache_path", fail)
+    with open(tmp_path / "run.log", "w", encoding="utf-8") as log_file:
+        node_ids = run_tests.discover_tests(
+            tmp_path, log_file, test_file_rel_paths=["test_a.py"], use_cache=False
+        )
+
+    assert [n.rsplit("::", 1)[-1] for n in node_ids] == ["test_a"]